@@ -10,6 +10,131 @@ PAYMENT_SERVICE_URL = os.getenv("PAYMENT_SERVICE_URL")
 NOTIFICATION_SERVICE_URL = os.getenv("NOTIFICATION_SERVICE_URL")
 FACE_SERVICE_URL = os.getenv("FACE_SERVICE_URL")
 
+
+def parse_replicas(value: str | None) -> list:
+    """
+    Parse a service URL setting into [(base_url, weight), ...]
+
+    Accepts a comma-separated list of replicas, each optionally suffixed
+    with ";weight=N", e.g. "http://hotel-1:8000;weight=2,http://hotel-2:8000"
+    """
+    replicas = []
+    for item in (value or "").split(","):
+        url, _, options = item.strip().partition(";")
+        if not url:
+            continue
+        weight = 1.0
+        if options.strip().startswith("weight="):
+            weight = float(options.strip()[len("weight="):])
+        replicas.append((url.rstrip("/"), weight))
+    return replicas
+
+
+# Backend name -> replicas, one pooled client is kept per replica
+SERVICES = {
+    "user": parse_replicas(USER_SERVICE_URL),
+    "hotel": parse_replicas(HOTEL_SERVICE_URL),
+    "booking": parse_replicas(BOOKING_SERVICE_URL),
+    "payment": parse_replicas(PAYMENT_SERVICE_URL),
+    "notification": parse_replicas(NOTIFICATION_SERVICE_URL),
+    "face": parse_replicas(FACE_SERVICE_URL),
+}
+
+# Replica selection: "p2c" (power of two choices) or "least_outstanding"
+LB_STRATEGY = os.getenv("LB_STRATEGY", "p2c")
+
+# Active health checks against each replica's /health
+HEALTH_CHECK_ENABLED = os.getenv("HEALTH_CHECK_ENABLED", "true").lower() == "true"
+HEALTH_CHECK_PATH = os.getenv("HEALTH_CHECK_PATH", "/health")
+HEALTH_CHECK_INTERVAL = float(os.getenv("HEALTH_CHECK_INTERVAL", 5.0))
+HEALTH_CHECK_TIMEOUT = float(os.getenv("HEALTH_CHECK_TIMEOUT", 1.0))
+HEALTH_CHECK_UNHEALTHY_THRESHOLD = int(os.getenv("HEALTH_CHECK_UNHEALTHY_THRESHOLD", 3))
+HEALTH_CHECK_HEALTHY_THRESHOLD = int(os.getenv("HEALTH_CHECK_HEALTHY_THRESHOLD", 2))
+
+# Gateway path prefix -> backend name used by the catch-all proxy
+PROXY_ROUTES = {
+    "auth": "user",
+    "hotels": "hotel",
+    "bookings": "booking",
+    "payments": "payment",
+    "notifications": "notification",
+    "faces": "face",
+}
+
+# Upstream connection pool settings (per backend)
+UPSTREAM_MAX_CONNECTIONS = int(os.getenv("UPSTREAM_MAX_CONNECTIONS", 100))
+UPSTREAM_MAX_KEEPALIVE = int(os.getenv("UPSTREAM_MAX_KEEPALIVE", 20))
+UPSTREAM_KEEPALIVE_EXPIRY = float(os.getenv("UPSTREAM_KEEPALIVE_EXPIRY", 30.0))
+UPSTREAM_CONNECT_TIMEOUT = float(os.getenv("UPSTREAM_CONNECT_TIMEOUT", 2.0))
+UPSTREAM_READ_TIMEOUT = float(os.getenv("UPSTREAM_READ_TIMEOUT", 10.0))
+UPSTREAM_WRITE_TIMEOUT = float(os.getenv("UPSTREAM_WRITE_TIMEOUT", 10.0))
+UPSTREAM_POOL_TIMEOUT = float(os.getenv("UPSTREAM_POOL_TIMEOUT", 2.0))
+UPSTREAM_HTTP2 = os.getenv("UPSTREAM_HTTP2", "false").lower() == "true"
+
+# Per-upstream circuit breaker
+CIRCUIT_WINDOW_SECONDS = int(os.getenv("CIRCUIT_WINDOW_SECONDS", 10))
+CIRCUIT_MIN_REQUESTS = int(os.getenv("CIRCUIT_MIN_REQUESTS", 20))
+CIRCUIT_ERROR_THRESHOLD = float(os.getenv("CIRCUIT_ERROR_THRESHOLD", 0.5))
+CIRCUIT_OPEN_SECONDS = float(os.getenv("CIRCUIT_OPEN_SECONDS", 30))
+CIRCUIT_HALF_OPEN_MAX_CALLS = int(os.getenv("CIRCUIT_HALF_OPEN_MAX_CALLS", 3))
+
+# Retries and hedging, applied to safe methods only
+RETRY_MAX_ATTEMPTS = int(os.getenv("RETRY_MAX_ATTEMPTS", 3))
+RETRY_BACKOFF_BASE = float(os.getenv("RETRY_BACKOFF_BASE", 0.05))
+RETRY_BACKOFF_MAX = float(os.getenv("RETRY_BACKOFF_MAX", 1.0))
+# Send a second copy of a GET if the first has not answered after this delay, 0 disables
+HEDGE_DELAY_MS = int(os.getenv("HEDGE_DELAY_MS", 0))
+
+# Composite view endpoints: per-upstream-call timeout and fan-out bound
+VIEW_LEG_TIMEOUT = float(os.getenv("VIEW_LEG_TIMEOUT", 2.0))
+VIEW_MAX_CONCURRENCY = int(os.getenv("VIEW_MAX_CONCURRENCY", 10))
+
+# Gateway response cache for idempotent GETs
+RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() == "true"
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", 32 * 1024 * 1024))
+RESPONSE_CACHE_MAX_ENTRY_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRY_BYTES", 1024 * 1024))
+# Path prefix -> TTL in seconds, longest matching prefix wins
+RESPONSE_CACHE_TTLS = {
+    "/hotels": int(os.getenv("CACHE_TTL_HOTELS", 60)),
+}
+
+# Negotiated response compression
+COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", 1024))
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", 6))
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", 4))
+
+# Access logging: fraction of requests logged; errors and slow requests always are
+ACCESS_LOG_SAMPLE_RATE = float(os.getenv("ACCESS_LOG_SAMPLE_RATE", 1.0))
+ACCESS_LOG_SLOW_MS = float(os.getenv("ACCESS_LOG_SLOW_MS", 1000))
+ACCESS_LOG_QUEUE_SIZE = int(os.getenv("ACCESS_LOG_QUEUE_SIZE", 10000))
+
 SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = os.getenv("ALGORITHM")
+
+# Edge JWT verification, disabled when SECRET_KEY is not set
+JWT_CACHE_MAX_ENTRIES = int(os.getenv("JWT_CACHE_MAX_ENTRIES", 10000))
+# Verified claims are reused for at most this long, which bounds how long a revoked token keeps working
+JWT_CACHE_TTL = float(os.getenv("JWT_CACHE_TTL", 30))
+# Ask the user-service whether a token was revoked before caching it
+JWT_REVOCATION_CHECK = os.getenv("JWT_REVOCATION_CHECK", "true").lower() == "true"
+JWT_INTROSPECT_PATH = os.getenv("JWT_INTROSPECT_PATH", "/auth/introspect")
+JWT_INTROSPECT_TIMEOUT = float(os.getenv("JWT_INTROSPECT_TIMEOUT", 1.0))
 RATE_LIMIT = int(os.getenv("RATE_LIMIT", 100))
+
+# Token-bucket rate limiting, limits are requests per minute
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+RATE_LIMIT_BURST = int(os.getenv("RATE_LIMIT_BURST", RATE_LIMIT))
+# "ip" or "subject" (JWT sub, falls back to client IP for anonymous calls)
+RATE_LIMIT_KEY = os.getenv("RATE_LIMIT_KEY", "ip")
+# Stricter per-route limits for the CPU-heavy auth endpoints (always keyed by IP)
+RATE_LIMIT_ROUTES = {
+    "/auth/login": int(os.getenv("RATE_LIMIT_LOGIN", 10)),
+    "/auth/register": int(os.getenv("RATE_LIMIT_REGISTER", 5)),
+}
+RATE_LIMIT_EXEMPT_PATHS = ("/", "/health", "/metrics")
+RATE_LIMIT_IDLE_SECONDS = float(os.getenv("RATE_LIMIT_IDLE_SECONDS", 300))
+RATE_LIMIT_MAX_BUCKETS = int(os.getenv("RATE_LIMIT_MAX_BUCKETS", 100000))
+# "memory" (per process) or "redis" (shared across gateway replicas)
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
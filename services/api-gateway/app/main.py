@@ -1,13 +1,36 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from app.routes import user_proxy
+from fastapi.responses import PlainTextResponse
+from app.routes import user_proxy, proxy_routes, view_routes
+from app.services.upstream_client import upstreams
+from app.services.response_cache import response_cache
+from app.services.rate_limiter import rate_limiter
+from app.services.resilience import breaker_states
+from app.services.token_cache import token_cache
+from app.services.metrics import request_metrics
 
 from app.middleware.cors_middleware import setup_cors
-from app.middleware.logging_middleware import log_requests
+from app.middleware.logging_middleware import log_requests, start_access_log, stop_access_log
+from app.middleware.rate_limit_middleware import rate_limit
+from app.middleware.auth_middleware import authenticate
+from app.middleware.compression_middleware import CompressionMiddleware, compression_stats
+from app.config.services_config import COMPRESSION_ENABLED
 
-app = FastAPI(title="Smart Hotel API Gateway")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    start_access_log()
+    await upstreams.startup()
+    yield
+    await upstreams.shutdown()
+    stop_access_log()
+
+
+app = FastAPI(title="Smart Hotel API Gateway", lifespan=lifespan)
 
 # Include proxy routes
 app.include_router(user_proxy.router, prefix="/users")
+app.include_router(view_routes.router)
 
 @app.get("/")
 def root():
@@ -15,7 +38,41 @@ def root():
 
 @app.get("/health")
 def health_check():
-    return {"status": "ok"}
+    upstream_breakers = breaker_states()
+    degraded = any(b["state"] != "closed" for b in upstream_breakers.values())
+    return {"status": "degraded" if degraded else "ok", "upstreams": upstream_breakers}
+
+@app.get("/health/upstreams")
+def upstream_stats():
+    return upstreams.stats()
+
+@app.get("/health/cache")
+def cache_stats():
+    return response_cache.stats()
+
+@app.get("/health/ratelimit")
+def rate_limit_stats():
+    return rate_limiter.stats()
+
+@app.get("/health/auth")
+def auth_stats():
+    return token_cache.stats()
+
+@app.get("/metrics")
+def metrics():
+    return PlainTextResponse(
+        request_metrics.render() + compression_stats.render(),
+        media_type="text/plain; version=0.0.4",
+    )
+
+# Catch-all proxy must be registered after every concrete gateway route
+app.include_router(proxy_routes.router)
 
+# The last registered middleware runs first: authenticate verifies the token
+# before rate_limit picks a bucket from its claims
+app.middleware("http")(rate_limit)
+app.middleware("http")(authenticate)
 setup_cors(app)
-app.middleware("http")(log_requests)
\ No newline at end of file
+app.middleware("http")(log_requests)
+if COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
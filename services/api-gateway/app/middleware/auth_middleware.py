@@ -0,0 +1,54 @@
+from fastapi import Request
+from fastapi.responses import JSONResponse
+from app.services.token_cache import token_cache
+from app.middleware.rate_limit_middleware import limit_rejected
+
+# Identity headers the gateway sets for backends; never accepted from clients
+IDENTITY_HEADERS = {
+    b"x-user-subject": "sub",
+    b"x-user-id": "user_id",
+    b"x-user-name": "username",
+    b"x-user-role": "role",
+}
+
+
+def _unauthorized(detail: str) -> JSONResponse:
+    return JSONResponse(
+        status_code=401,
+        content={"detail": detail},
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+async def authenticate(request: Request, call_next):
+    """
+    Verify bearer tokens once at the edge and forward the identity
+
+    Requests without a token pass through anonymously; requests with an
+    invalid, expired or revoked token are rejected before reaching any
+    backend, and the rejection is charged to the client IP's rate-limit
+    bucket. Runs before `rate_limit`, which keys on the verified claims
+    left in request.state.
+    """
+    headers = [
+        (name, value)
+        for name, value in request.scope["headers"]
+        if name not in IDENTITY_HEADERS
+    ]
+
+    auth = request.headers.get("authorization", "")
+    if token_cache.enabled and auth.lower().startswith("bearer "):
+        claims = await token_cache.verify(auth[7:].strip())
+        if claims is None:
+            return await limit_rejected(request, _unauthorized("Could not validate credentials"))
+        if claims.get("type", "access") != "access":
+            # Refresh tokens are only good at /auth/refresh, which takes them in the body
+            return await limit_rejected(request, _unauthorized("Access token required"))
+        request.state.principal = claims
+        for header, claim in IDENTITY_HEADERS.items():
+            if claims.get(claim) is not None:
+                headers.append((header, str(claims[claim]).encode("utf-8")))
+
+    # Downstream handlers build their Request from this scope
+    request.scope["headers"] = headers
+    return await call_next(request)
@@ -0,0 +1,212 @@
+import time
+import zlib
+from app.config.services_config import COMPRESSION_MIN_SIZE, GZIP_LEVEL, BROTLI_QUALITY
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional, gzip is always available
+    brotli = None
+
+_COMPRESSIBLE_PREFIXES = ("text/", "application/json", "application/javascript", "application/xml",
+                          "application/x-ndjson", "image/svg+xml")
+_COMPRESSIBLE_SUFFIXES = ("+json", "+xml")
+
+
+class CompressionStats:
+    def __init__(self):
+        self.responses = {}
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.cpu_seconds = 0.0
+        self.skipped_small = 0
+        self.passthrough_encoded = 0
+
+    def render(self) -> str:
+        ratio = self.bytes_out / self.bytes_in if self.bytes_in else 0.0
+        lines = [
+            "# HELP gateway_compression_responses_total Responses compressed by the gateway",
+            "# TYPE gateway_compression_responses_total counter",
+        ]
+        for encoding, count in sorted(self.responses.items()):
+            lines.append(f'gateway_compression_responses_total{{encoding="{encoding}"}} {count}')
+        lines += [
+            "# TYPE gateway_compression_bytes_in_total counter",
+            f"gateway_compression_bytes_in_total {self.bytes_in}",
+            "# TYPE gateway_compression_bytes_out_total counter",
+            f"gateway_compression_bytes_out_total {self.bytes_out}",
+            "# HELP gateway_compression_ratio Compressed over uncompressed bytes since start",
+            "# TYPE gateway_compression_ratio gauge",
+            f"gateway_compression_ratio {ratio:.4f}",
+            "# TYPE gateway_compression_cpu_seconds_total counter",
+            f"gateway_compression_cpu_seconds_total {self.cpu_seconds:.6f}",
+            "# TYPE gateway_compression_skipped_total counter",
+            f'gateway_compression_skipped_total{{reason="below_threshold"}} {self.skipped_small}',
+            f'gateway_compression_skipped_total{{reason="already_encoded"}} {self.passthrough_encoded}',
+        ]
+        return "\n".join(lines) + "\n"
+
+
+compression_stats = CompressionStats()
+
+
+def _negotiate(accept_encoding: str) -> str | None:
+    accepted = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[coding.strip().lower()] = q
+    if brotli is not None and accepted.get("br", 0) > 0:
+        return "br"
+    if accepted.get("gzip", 0) > 0:
+        return "gzip"
+    return None
+
+
+def _is_compressible(content_type: str) -> bool:
+    content_type = content_type.split(";", 1)[0].strip().lower()
+    return content_type.startswith(_COMPRESSIBLE_PREFIXES) or content_type.endswith(_COMPRESSIBLE_SUFFIXES)
+
+
+class _Encoder:
+    """Incremental gzip/brotli encoder that records CPU time"""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        else:
+            self._compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def feed(self, data: bytes, final: bool) -> bytes:
+        start = time.thread_time()
+        if self.encoding == "br":
+            out = self._compressor.process(data)
+            if final:
+                out += self._compressor.finish()
+        else:
+            out = self._compressor.compress(data)
+            if final:
+                out += self._compressor.flush()
+        compression_stats.cpu_seconds += time.thread_time() - start
+        compression_stats.bytes_in += len(data)
+        compression_stats.bytes_out += len(out)
+        return out
+
+
+class CompressionMiddleware:
+    """
+    Negotiated gzip/brotli compression as a pure ASGI middleware.
+
+    Bodies are compressed chunk by chunk as they stream through, never
+    buffered whole. Only the first COMPRESSION_MIN_SIZE bytes of an
+    unknown-length body are held back to decide whether to compress.
+    Responses that already carry a Content-Encoding pass through untouched.
+    """
+
+    def __init__(self, app, minimum_size: int = COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+        accept_encoding = ""
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+                break
+        encoding = _negotiate(accept_encoding)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await _CompressedResponder(self.app, encoding, self.minimum_size)(scope, receive, send)
+
+
+class _CompressedResponder:
+    def __init__(self, app, encoding: str, minimum_size: int):
+        self.app = app
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.send = None
+        self.start_message = None
+        self.pending = b""
+        self.encoder = None
+        self.passthrough = False
+
+    async def __call__(self, scope, receive, send):
+        self.send = send
+        await self.app(scope, receive, self.send_wrapper)
+
+    async def send_wrapper(self, message):
+        if message["type"] == "http.response.start":
+            self._inspect_start(message)
+            if self.passthrough:
+                await self.send(message)
+            else:
+                self.start_message = message
+            return
+
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.encoder is None:
+            self.pending += body
+            if len(self.pending) < self.minimum_size:
+                if more_body:
+                    return
+                # Whole body turned out to be small, send it as-is
+                compression_stats.skipped_small += 1
+                await self.send(self.start_message)
+                await self.send({"type": "http.response.body", "body": self.pending})
+                return
+            await self._begin()
+            body, self.pending = self.pending, b""
+
+        out = self.encoder.feed(body, final=not more_body)
+        if out or not more_body:
+            await self.send({"type": "http.response.body", "body": out, "more_body": more_body})
+
+    def _inspect_start(self, message):
+        headers = {name.lower(): value for name, value in message.get("headers", [])}
+        status = message["status"]
+        if b"content-encoding" in headers:
+            compression_stats.passthrough_encoded += 1
+            self.passthrough = True
+        elif status < 200 or status in (204, 206, 304):
+            self.passthrough = True
+        elif not _is_compressible(headers.get(b"content-type", b"").decode("latin-1")):
+            self.passthrough = True
+        elif b"content-length" in headers and int(headers[b"content-length"]) < self.minimum_size:
+            compression_stats.skipped_small += 1
+            self.passthrough = True
+
+    async def _begin(self):
+        self.encoder = _Encoder(self.encoding)
+        compression_stats.responses[self.encoding] = compression_stats.responses.get(self.encoding, 0) + 1
+        headers = []
+        for name, value in self.start_message.get("headers", []):
+            lname = name.lower()
+            if lname == b"content-length":
+                continue
+            if lname == b"etag" and not value.startswith(b"W/"):
+                # The encoded representation is no longer byte-identical
+                value = b"W/" + value
+            if lname == b"vary":
+                continue
+            headers.append((name, value))
+        vary = [v for n, v in self.start_message.get("headers", []) if n.lower() == b"vary"]
+        headers.append((b"vary", b", ".join(vary + [b"Accept-Encoding"])))
+        headers.append((b"content-encoding", self.encoding.encode("latin-1")))
+        self.start_message["headers"] = headers
+        await self.send(self.start_message)
@@ -8,4 +8,6 @@ def setup_cors(app):
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        # Cursor for keyset-paginated listings
+        expose_headers=["X-Next-Cursor"],
     )
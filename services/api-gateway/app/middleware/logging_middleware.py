@@ -1,12 +1,98 @@
 from fastapi import Request
+import json
 import logging
+import logging.handlers
+import queue
+import random
 import time
+from app.config.services_config import (
+    PROXY_ROUTES,
+    ACCESS_LOG_SAMPLE_RATE,
+    ACCESS_LOG_SLOW_MS,
+    ACCESS_LOG_QUEUE_SIZE,
+)
+from app.services.metrics import request_metrics
 
 logger = logging.getLogger("api_gateway")
+access_logger = logging.getLogger("api_gateway.access")
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        if isinstance(record.msg, dict):
+            return json.dumps(record.msg, separators=(",", ":"), default=str)
+        return json.dumps({"level": record.levelname, "message": record.getMessage()})
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """
+    Hands records to a background listener without ever blocking the
+    request: formatting is deferred to the listener thread and records
+    are dropped (and counted) when the queue is full.
+    """
+
+    dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            DroppingQueueHandler.dropped += 1
+
+
+_log_queue: queue.Queue = queue.Queue(maxsize=ACCESS_LOG_QUEUE_SIZE)
+_stream_handler = logging.StreamHandler()
+_stream_handler.setFormatter(JsonFormatter())
+_listener = logging.handlers.QueueListener(_log_queue, _stream_handler)
+
+access_logger.addHandler(DroppingQueueHandler(_log_queue))
+access_logger.setLevel(logging.INFO)
+access_logger.propagate = False
+
+
+def start_access_log():
+    _listener.start()
+
+
+def stop_access_log():
+    # Flushes whatever is still queued
+    _listener.stop()
+
+
+def _route_label(request: Request) -> str:
+    """Route template rather than raw URL, keeps metric cardinality bounded"""
+    route = request.scope.get("route")
+    if route is None:
+        return "unmatched"
+    prefix = request.scope.get("path_params", {}).get("prefix")
+    if route.path.startswith("/{prefix}"):
+        return f"/{prefix}/*" if prefix in PROXY_ROUTES else "unmatched"
+    return route.path
+
 
 async def log_requests(request: Request, call_next):
-    start_time = time.time()
-    response = await call_next(request)
-    process_time = time.time() - start_time
-    logger.info(f"{request.method} {request.url} completed in {process_time:.2f}s")
-    return response
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        elapsed = time.perf_counter() - start
+        route = _route_label(request)
+        request_metrics.observe(route, request.method, status, elapsed)
+
+        elapsed_ms = elapsed * 1000
+        if status >= 500 or elapsed_ms >= ACCESS_LOG_SLOW_MS or random.random() < ACCESS_LOG_SAMPLE_RATE:
+            access_logger.info({
+                "ts": time.time(),
+                "method": request.method,
+                "route": route,
+                "path": request.url.path,
+                "status": status,
+                "duration_ms": round(elapsed_ms, 2),
+                "client": request.client.host if request.client else None,
+            })
@@ -0,0 +1,89 @@
+from fastapi import Request
+from fastapi.responses import JSONResponse, Response
+import math
+from app.config.services_config import RATE_LIMIT_ENABLED, RATE_LIMIT_KEY, RATE_LIMIT_EXEMPT_PATHS
+from app.services.rate_limiter import rate_limiter
+
+
+def _is_exempt(path: str) -> bool:
+    return any(
+        path == exempt or (exempt != "/" and path.startswith(exempt + "/"))
+        for exempt in RATE_LIMIT_EXEMPT_PATHS
+    )
+
+
+def _client_ip(request: Request) -> str:
+    # X-Forwarded-For is client controlled; run uvicorn with --proxy-headers behind a trusted LB
+    return request.client.host if request.client else "unknown"
+
+
+def _verified_subject(request: Request) -> str | None:
+    """
+    The `sub` of a token the auth middleware has already verified
+
+    Never read from the raw Authorization header: an unverified payload
+    would let a client pick a fresh bucket per request.
+    """
+    principal = getattr(request.state, "principal", None)
+    return principal.get("sub") if principal else None
+
+
+def _client_key(request: Request, by_subject: bool) -> str:
+    if by_subject:
+        subject = _verified_subject(request)
+        if subject:
+            return f"sub:{subject}"
+    return f"ip:{_client_ip(request)}"
+
+
+async def _limited(request: Request, respond, by_subject: bool):
+    """Charge the caller's bucket, then produce the response with respond(request) or a 429"""
+    if not RATE_LIMIT_ENABLED or _is_exempt(request.url.path):
+        return await respond(request)
+
+    policy = rate_limiter.policy_for(request.url.path)
+    if policy.per_minute <= 0:
+        return await respond(request)
+
+    # Auth endpoints are always limited per IP; no token exists there yet
+    by_subject = by_subject and RATE_LIMIT_KEY == "subject" and policy is rate_limiter.default_policy
+    result = await rate_limiter.acquire(_client_key(request, by_subject), policy)
+
+    if not result.allowed:
+        return JSONResponse(
+            status_code=429,
+            content={"detail": "Too many requests"},
+            headers={
+                "Retry-After": str(math.ceil(result.retry_after)),
+                "X-RateLimit-Limit": str(policy.per_minute),
+                "X-RateLimit-Remaining": "0",
+            },
+        )
+
+    response = await respond(request)
+    response.headers["X-RateLimit-Limit"] = str(policy.per_minute)
+    response.headers["X-RateLimit-Remaining"] = str(result.remaining)
+    return response
+
+
+async def rate_limit(request: Request, call_next):
+    """
+    Token-bucket limit per client
+
+    Must run inside `authenticate` (registered before it) so subject keys
+    come from verified claims; anonymous callers are keyed by IP.
+    """
+    return await _limited(request, call_next, by_subject=True)
+
+
+async def limit_rejected(request: Request, response: Response) -> Response:
+    """
+    Rate-limit a request the auth middleware is rejecting
+
+    Rejected tokens never reach `rate_limit`, so they are charged to the
+    client IP here; otherwise invalid tokens would be unlimited.
+    """
+    async def respond(_):
+        return response
+
+    return await _limited(request, respond, by_subject=False)
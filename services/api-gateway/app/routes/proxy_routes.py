@@ -0,0 +1,20 @@
+from fastapi import APIRouter, HTTPException, Request
+from app.config.services_config import PROXY_ROUTES
+from app.services.proxy_service import forward
+
+router = APIRouter()
+
+PROXY_METHODS = ["GET", "POST", "PUT", "PATCH", "DELETE", "HEAD", "OPTIONS"]
+
+
+@router.api_route("/{prefix}", methods=PROXY_METHODS, include_in_schema=False)
+@router.api_route("/{prefix}/{path:path}", methods=PROXY_METHODS, include_in_schema=False)
+async def proxy(request: Request, prefix: str, path: str = ""):
+    """
+    Catch-all reverse proxy: /<prefix>/... is forwarded unchanged to the
+    backend mapped to <prefix> in PROXY_ROUTES
+    """
+    service = PROXY_ROUTES.get(prefix)
+    if service is None:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return await forward(request, service)
@@ -1,20 +1,23 @@
 from fastapi import APIRouter, HTTPException
 import httpx
-from app.config.services_config import USER_SERVICE_URL
+from app.services.upstream_client import upstreams, UpstreamNotConfigured
+from app.services.resilience import send_with_resilience, CircuitOpenError
 
 router = APIRouter()
 
 @router.get("/{user_id}")
 async def get_user(user_id: int):
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(f"{USER_SERVICE_URL}/users/{user_id}")
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPError as e:
-            raise HTTPException(status_code=500, detail=str(e))
+    try:
+        request = upstreams.build_request("user", "GET", f"/users/{user_id}")
+        response = await send_with_resilience("user", request)
+        response.raise_for_status()
+        return response.json()
+    except (UpstreamNotConfigured, CircuitOpenError) as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except httpx.HTTPError as e:
+        raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/test")
 def test():
-    return {"message": "User proxy works"}
\ No newline at end of file
+    return {"message": "User proxy works"}
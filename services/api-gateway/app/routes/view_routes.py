@@ -0,0 +1,34 @@
+from fastapi import APIRouter, HTTPException, Query, Request
+from app.services.aggregation_service import booking_view, bookings_view, leg_headers, LegError
+
+router = APIRouter(prefix="/views", tags=["Views"])
+
+
+def _raise_for_leg(e: LegError):
+    if e.status_code == 404:
+        raise HTTPException(status_code=404, detail="Booking not found")
+    if e.reason == "timeout":
+        raise HTTPException(status_code=504, detail=str(e))
+    raise HTTPException(status_code=502, detail=str(e))
+
+
+@router.get("/bookings/{booking_id}")
+async def get_booking_view(booking_id: int, request: Request):
+    """Booking plus its hotel and guest in one round trip"""
+    try:
+        return await booking_view(booking_id, leg_headers(request))
+    except LegError as e:
+        _raise_for_leg(e)
+
+
+@router.get("/bookings")
+async def list_booking_views(
+    request: Request,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=200),
+):
+    """Page of bookings with their hotels and guests"""
+    try:
+        return await bookings_view(leg_headers(request), skip, limit)
+    except LegError as e:
+        _raise_for_leg(e)
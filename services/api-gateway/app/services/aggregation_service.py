@@ -0,0 +1,137 @@
+import asyncio
+import logging
+import httpx
+from fastapi import Request
+from app.config.services_config import VIEW_LEG_TIMEOUT, VIEW_MAX_CONCURRENCY
+from app.services.upstream_client import upstreams, UpstreamNotConfigured
+from app.services.resilience import send_with_resilience, CircuitOpenError
+
+logger = logging.getLogger("api_gateway")
+
+# Caller headers passed on to every leg so backends see the same identity
+_FORWARDED_HEADERS = ("authorization", "x-user-subject", "x-user-id", "x-user-name", "x-user-role")
+
+
+class LegError(Exception):
+    """A single upstream call of a composite view failed"""
+
+    def __init__(self, service: str, reason: str, status_code: int | None = None):
+        super().__init__(f"{service}: {reason}")
+        self.service = service
+        self.reason = reason
+        self.status_code = status_code
+
+
+def leg_headers(request: Request) -> dict:
+    return {name: request.headers[name] for name in _FORWARDED_HEADERS if name in request.headers}
+
+
+async def fetch_json(service: str, path: str, headers: dict, timeout: float = VIEW_LEG_TIMEOUT):
+    """
+    GET a JSON document from a backend within a per-leg deadline
+
+    Raises:
+        LegError: On timeout, transport error, open circuit or non-2xx status
+    """
+    try:
+        request = upstreams.build_request(service, "GET", path, headers=headers)
+        response = await asyncio.wait_for(send_with_resilience(service, request), timeout)
+    except asyncio.TimeoutError:
+        raise LegError(service, "timeout")
+    except (UpstreamNotConfigured, CircuitOpenError) as e:
+        raise LegError(service, str(e))
+    except httpx.HTTPError as e:
+        raise LegError(service, f"upstream error: {type(e).__name__}")
+
+    if response.status_code >= 400:
+        raise LegError(service, f"status {response.status_code}", response.status_code)
+    return response.json()
+
+
+async def _optional_leg(service: str, path: str, headers: dict, errors: dict, error_key: str):
+    """Fetch a related resource; failures are recorded instead of raised"""
+    try:
+        return await fetch_json(service, path, headers)
+    except LegError as e:
+        logger.warning(f"Composite view leg failed: {str(e)}")
+        errors[error_key] = e.reason
+        return None
+
+
+async def booking_view(booking_id: int, headers: dict) -> dict:
+    """
+    Booking with its hotel and guest
+
+    The booking leg is required and its failure is raised; hotel and user
+    are fetched concurrently and come back as null with an entry in
+    `errors` if their leg fails.
+    """
+    booking = await fetch_json("booking", f"/bookings/{booking_id}", headers)
+    errors = {}
+    hotel, user = await asyncio.gather(
+        _optional_leg("hotel", f"/hotels/{booking['hotel_id']}", headers, errors, "hotel"),
+        _optional_leg("user", f"/auth/users/{booking['user_id']}", headers, errors, "user"),
+    )
+    return {"booking": booking, "hotel": hotel, "user": user, "errors": errors}
+
+
+async def _fetch_many(service: str, path_template: str, ids: set, headers: dict, errors: dict) -> dict:
+    """
+    Fetch each distinct id once with bounded concurrency
+
+    Still one GET per id, for backends without a batch lookup.
+    """
+    semaphore = asyncio.Semaphore(VIEW_MAX_CONCURRENCY)
+
+    async def fetch_one(resource_id):
+        async with semaphore:
+            return resource_id, await _optional_leg(
+                service, path_template.format(resource_id), headers, errors, f"{service}:{resource_id}"
+            )
+
+    return dict(await asyncio.gather(*(fetch_one(resource_id) for resource_id in ids)))
+
+
+async def _fetch_users(user_ids: set, headers: dict, errors: dict) -> dict:
+    """All users of a page in one batch call to user-service"""
+    if not user_ids:
+        return {}
+    query = "&".join(f"ids={user_id}" for user_id in sorted(user_ids))
+    users = await _optional_leg("user", f"/auth/users?{query}", headers, errors, "user")
+    if users is None:
+        return {}
+    found = {user["id"]: user for user in users}
+    for user_id in user_ids - set(found):
+        # Unknown, or not visible to the caller
+        errors[f"user:{user_id}"] = "not found"
+    return found
+
+
+async def bookings_view(headers: dict, skip: int = 0, limit: int = 50) -> dict:
+    """
+    Page of bookings joined with hotels and users
+
+    Only the requested page is fetched from booking-service. Users come
+    from one batch lookup. Hotel ids are de-duplicated so each hotel is
+    fetched once, with bounded concurrency.
+    """
+    # booking-service pages in SQL; the slice only guards against an upstream that ignores limit
+    bookings = (await fetch_json("booking", f"/bookings/?skip={skip}&limit={limit}", headers))[:limit]
+    errors = {}
+    hotel_ids = {b["hotel_id"] for b in bookings if b.get("hotel_id") is not None}
+    user_ids = {b["user_id"] for b in bookings if b.get("user_id") is not None}
+    hotels, users = await asyncio.gather(
+        _fetch_many("hotel", "/hotels/{}", hotel_ids, headers, errors),
+        _fetch_users(user_ids, headers, errors),
+    )
+    return {
+        "items": [
+            {
+                "booking": booking,
+                "hotel": hotels.get(booking.get("hotel_id")),
+                "user": users.get(booking.get("user_id")),
+            }
+            for booking in bookings
+        ],
+        "errors": errors,
+    }
@@ -0,0 +1,87 @@
+from bisect import bisect_left
+
+# Upper bounds in seconds, Prometheus default buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram, O(log buckets) per observation"""
+
+    def __init__(self, buckets: tuple = LATENCY_BUCKETS):
+        self.buckets = buckets
+        # Last slot counts observations above the largest bound (+Inf)
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds: float):
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile by linear interpolation inside its bucket"""
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            if seen + bucket_count >= rank and bucket_count:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                if i == len(self.buckets):
+                    return lower
+                upper = self.buckets[i]
+                return lower + (upper - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return self.buckets[-1]
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels) -> str:
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+class RequestMetrics:
+    """Per route/method/status latency histograms rendered as Prometheus text"""
+
+    def __init__(self):
+        self._histograms: dict[tuple, LatencyHistogram] = {}
+
+    def observe(self, route: str, method: str, status: int, seconds: float):
+        key = (route, method, status)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            histogram = self._histograms[key] = LatencyHistogram()
+        histogram.observe(seconds)
+
+    def render(self) -> str:
+        lines = [
+            "# HELP gateway_request_duration_seconds Gateway request latency",
+            "# TYPE gateway_request_duration_seconds histogram",
+        ]
+        for (route, method, status), histogram in sorted(self._histograms.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(histogram.buckets, histogram.counts):
+                cumulative += bucket_count
+                labels = _labels(route=route, method=method, status=status, le=bound)
+                lines.append(f"gateway_request_duration_seconds_bucket{labels} {cumulative}")
+            labels = _labels(route=route, method=method, status=status, le="+Inf")
+            lines.append(f"gateway_request_duration_seconds_bucket{labels} {histogram.count}")
+            labels = _labels(route=route, method=method, status=status)
+            lines.append(f"gateway_request_duration_seconds_sum{labels} {histogram.sum:.6f}")
+            lines.append(f"gateway_request_duration_seconds_count{labels} {histogram.count}")
+
+        lines.append("# HELP gateway_request_latency_seconds Estimated latency quantiles since start")
+        lines.append("# TYPE gateway_request_latency_seconds gauge")
+        for (route, method, status), histogram in sorted(self._histograms.items()):
+            for q in QUANTILES:
+                labels = _labels(route=route, method=method, status=status, quantile=q)
+                lines.append(f"gateway_request_latency_seconds{labels} {histogram.quantile(q):.6f}")
+        return "\n".join(lines) + "\n"
+
+
+request_metrics = RequestMetrics()
@@ -0,0 +1,182 @@
+import logging
+import httpx
+from fastapi import Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from starlette.background import BackgroundTask
+from app.services.upstream_client import upstreams, UpstreamNotConfigured
+from app.services.response_cache import response_cache, CachedResponse, SAFE_METHODS
+from app.services.resilience import send_with_resilience, CircuitOpenError
+
+logger = logging.getLogger("api_gateway")
+
+# RFC 7230 section 6.1 - never forwarded by a proxy
+HOP_BY_HOP_HEADERS = frozenset({
+    "connection",
+    "keep-alive",
+    "proxy-authenticate",
+    "proxy-authorization",
+    "proxy-connection",
+    "te",
+    "trailer",
+    "trailers",
+    "transfer-encoding",
+    "upgrade",
+})
+
+
+def strip_hop_by_hop(raw_headers: list) -> list:
+    """
+    Drop hop-by-hop headers, including any extra ones named in Connection
+
+    Args:
+        raw_headers: List of (name, value) byte pairs
+
+    Returns:
+        list: Filtered (name, value) byte pairs, duplicates preserved
+    """
+    drop = set(HOP_BY_HOP_HEADERS)
+    for name, value in raw_headers:
+        if name.lower() == b"connection":
+            drop.update(token.strip().lower() for token in value.decode("latin-1").split(","))
+    return [
+        (name, value)
+        for name, value in raw_headers
+        if name.decode("latin-1").lower() not in drop
+    ]
+
+
+def build_upstream_headers(request: Request) -> list:
+    headers = [
+        (name, value)
+        for name, value in strip_hop_by_hop(request.headers.raw)
+        if name.lower() != b"host"
+    ]
+    client_host = request.client.host if request.client else ""
+    forwarded_for = request.headers.get("x-forwarded-for")
+    forwarded_for = f"{forwarded_for}, {client_host}" if forwarded_for else client_host
+    headers = [(n, v) for n, v in headers if not n.lower().startswith(b"x-forwarded-")]
+    headers.append((b"x-forwarded-for", forwarded_for.encode("latin-1")))
+    headers.append((b"x-forwarded-proto", request.url.scheme.encode("latin-1")))
+    headers.append((b"x-forwarded-host", request.headers.get("host", "").encode("latin-1")))
+    return headers
+
+
+def _has_body(request: Request) -> bool:
+    return "content-length" in request.headers or "transfer-encoding" in request.headers
+
+
+def build_upstream_request(request: Request, service: str) -> httpx.Request:
+    url = request.url.path
+    if request.url.query:
+        url = f"{url}?{request.url.query}"
+    return upstreams.build_request(
+        service,
+        request.method,
+        url,
+        headers=build_upstream_headers(request),
+        # Pass the body through chunk by chunk instead of buffering it
+        content=request.stream() if _has_body(request) else None,
+    )
+
+
+def stream_response(upstream_response: httpx.Response) -> StreamingResponse:
+    response = StreamingResponse(
+        upstream_response.aiter_raw(),
+        status_code=upstream_response.status_code,
+        background=BackgroundTask(upstream_response.aclose),
+    )
+    # Raw passthrough keeps repeated headers (Set-Cookie) and Content-Encoding intact
+    response.raw_headers = strip_hop_by_hop(upstream_response.headers.raw)
+    return response
+
+
+async def _send(request: Request, service: str) -> httpx.Response:
+    upstream_request = build_upstream_request(request, service)
+    return await send_with_resilience(service, upstream_request, stream=True)
+
+
+async def _load_cacheable(request: Request, service: str, key: tuple, ttl: int):
+    """
+    Fetch a cacheable GET from upstream
+
+    Returns:
+        CachedResponse if the response could be buffered and stored,
+        otherwise a response the calling request can return as-is
+    """
+    upstream_response = await _send(request, service)
+    length = upstream_response.headers.get("content-length")
+    if (
+        upstream_response.status_code != 200
+        or length is None
+        or int(length) > response_cache.max_entry_bytes
+    ):
+        return stream_response(upstream_response)
+
+    try:
+        body = b"".join([chunk async for chunk in upstream_response.aiter_raw()])
+    finally:
+        await upstream_response.aclose()
+    raw_headers = strip_hop_by_hop(upstream_response.headers.raw)
+    entry = response_cache.build_entry(upstream_response.status_code, raw_headers, body, ttl)
+    if entry is None:
+        response = Response(content=body, status_code=upstream_response.status_code)
+        response.raw_headers = raw_headers
+        return response
+    response_cache.store(key, entry)
+    return entry
+
+
+async def _forward_cached(request: Request, service: str, ttl: int):
+    key = response_cache.key_for(request)
+    entry = response_cache.get(key)
+    if entry is not None:
+        return response_cache.respond(entry, request, "HIT")
+
+    result, is_leader = await response_cache.coalesce(
+        key, lambda: _load_cacheable(request, service, key, ttl)
+    )
+    if isinstance(result, CachedResponse):
+        return response_cache.respond(result, request, "MISS" if is_leader else "HIT")
+    if is_leader:
+        return result
+    # Leader's response was not shareable, fetch our own copy
+    return stream_response(await _send(request, service))
+
+
+async def forward(request: Request, service: str):
+    """
+    Forward a gateway request to a backend, streaming both bodies
+
+    Cacheable GETs are served through the response cache; successful
+    writes invalidate the cached entries of the route they touch.
+
+    Args:
+        request: Incoming gateway request
+        service: Backend name from SERVICES
+
+    Returns:
+        Response relaying the upstream status, headers and body
+    """
+    try:
+        ttl = response_cache.ttl_for(request)
+        if ttl is not None:
+            return await _forward_cached(request, service, ttl)
+        upstream_response = await _send(request, service)
+    except UpstreamNotConfigured as e:
+        return JSONResponse(status_code=503, content={"detail": str(e)})
+    except CircuitOpenError as e:
+        return JSONResponse(
+            status_code=503,
+            content={"detail": str(e)},
+            headers={"Retry-After": str(max(1, int(e.retry_after)))},
+        )
+    except httpx.TimeoutException:
+        logger.warning(f"Upstream {service} timed out for {request.method} {request.url.path}")
+        return JSONResponse(status_code=504, content={"detail": f"Upstream '{service}' timed out"})
+    except httpx.HTTPError as e:
+        logger.error(f"Upstream {service} error for {request.method} {request.url.path}: {str(e)}")
+        return JSONResponse(status_code=502, content={"detail": f"Upstream '{service}' unavailable"})
+
+    if request.method not in SAFE_METHODS and upstream_response.status_code < 400:
+        response_cache.invalidate(request.url.path)
+    return stream_response(upstream_response)
@@ -0,0 +1,172 @@
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from app.config.services_config import (
+    RATE_LIMIT,
+    RATE_LIMIT_BURST,
+    RATE_LIMIT_ROUTES,
+    RATE_LIMIT_IDLE_SECONDS,
+    RATE_LIMIT_MAX_BUCKETS,
+    RATE_LIMIT_BACKEND,
+    REDIS_URL,
+)
+
+logger = logging.getLogger("api_gateway")
+
+
+@dataclass
+class RateLimitPolicy:
+    name: str
+    per_minute: int
+    burst: int
+
+    @property
+    def rate(self) -> float:
+        """Tokens refilled per second"""
+        return self.per_minute / 60.0
+
+
+@dataclass
+class RateLimitResult:
+    allowed: bool
+    remaining: int
+    retry_after: float
+
+
+class InMemoryRateLimitBackend:
+    """
+    Per-process token buckets, O(1) per request.
+
+    Buckets live in an OrderedDict in last-used order, so idle buckets sit
+    at the front and are evicted cheaply on each call.
+    """
+
+    def __init__(self, idle_seconds: float, max_buckets: int):
+        self.idle_seconds = idle_seconds
+        self.max_buckets = max_buckets
+        # key -> [tokens, last_refill]
+        self._buckets: OrderedDict[str, list] = OrderedDict()
+        self.evictions = 0
+
+    async def acquire(self, key: str, policy: RateLimitPolicy) -> RateLimitResult:
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = [float(policy.burst), now]
+            self._buckets[key] = bucket
+        else:
+            self._buckets.move_to_end(key)
+            bucket[0] = min(policy.burst, bucket[0] + (now - bucket[1]) * policy.rate)
+            bucket[1] = now
+        self._evict(now)
+
+        if bucket[0] >= 1.0:
+            bucket[0] -= 1.0
+            return RateLimitResult(True, int(bucket[0]), 0.0)
+        return RateLimitResult(False, 0, (1.0 - bucket[0]) / policy.rate)
+
+    def _evict(self, now: float):
+        while self._buckets:
+            key, (_, last_refill) = next(iter(self._buckets.items()))
+            if len(self._buckets) <= self.max_buckets and now - last_refill < self.idle_seconds:
+                break
+            del self._buckets[key]
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        return {"backend": "memory", "buckets": len(self._buckets), "evictions": self.evictions}
+
+
+# Atomic refill-and-take so replicas sharing Redis never double-spend tokens
+_REDIS_TOKEN_BUCKET = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local ttl = tonumber(ARGV[4])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + (now - ts) * rate)
+local allowed = 0
+if tokens >= 1 then
+  tokens = tokens - 1
+  allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], ttl)
+return {allowed, tostring(tokens)}
+"""
+
+
+class RedisRateLimitBackend:
+    """
+    Token buckets shared across gateway replicas via Redis.
+
+    Idle buckets expire through Redis TTLs. If Redis is unreachable the
+    limiter fails open rather than rejecting all traffic.
+    """
+
+    def __init__(self, url: str, idle_seconds: float):
+        try:
+            from redis import asyncio as aioredis
+        except ImportError:
+            raise RuntimeError("RATE_LIMIT_BACKEND=redis requires the 'redis' package")
+        self._redis = aioredis.from_url(url)
+        self._script = self._redis.register_script(_REDIS_TOKEN_BUCKET)
+        self.idle_seconds = int(idle_seconds)
+        self.errors = 0
+
+    async def acquire(self, key: str, policy: RateLimitPolicy) -> RateLimitResult:
+        try:
+            allowed, tokens = await self._script(
+                keys=[f"ratelimit:{key}"],
+                args=[policy.rate, policy.burst, time.time(), self.idle_seconds],
+            )
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"Rate limit backend error, allowing request: {str(e)}")
+            return RateLimitResult(True, policy.burst, 0.0)
+        tokens = float(tokens)
+        if allowed:
+            return RateLimitResult(True, int(tokens), 0.0)
+        return RateLimitResult(False, 0, (1.0 - tokens) / policy.rate)
+
+    def stats(self) -> dict:
+        return {"backend": "redis", "errors": self.errors}
+
+
+class RateLimiter:
+    def __init__(self, backend, default_policy: RateLimitPolicy, route_policies: dict):
+        self.backend = backend
+        self.default_policy = default_policy
+        self.route_policies = route_policies
+        self.rejected = 0
+
+    def policy_for(self, path: str) -> RateLimitPolicy:
+        return self.route_policies.get(path.rstrip("/") or "/", self.default_policy)
+
+    async def acquire(self, client_key: str, policy: RateLimitPolicy) -> RateLimitResult:
+        result = await self.backend.acquire(f"{policy.name}:{client_key}", policy)
+        if not result.allowed:
+            self.rejected += 1
+        return result
+
+    def stats(self) -> dict:
+        return {"rejected": self.rejected, **self.backend.stats()}
+
+
+def _build_backend():
+    if RATE_LIMIT_BACKEND == "redis":
+        return RedisRateLimitBackend(REDIS_URL, RATE_LIMIT_IDLE_SECONDS)
+    return InMemoryRateLimitBackend(RATE_LIMIT_IDLE_SECONDS, RATE_LIMIT_MAX_BUCKETS)
+
+
+rate_limiter = RateLimiter(
+    _build_backend(),
+    RateLimitPolicy("default", RATE_LIMIT, RATE_LIMIT_BURST),
+    {
+        path: RateLimitPolicy(path, per_minute, per_minute)
+        for path, per_minute in RATE_LIMIT_ROUTES.items()
+    },
+)
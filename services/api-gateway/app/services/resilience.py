@@ -0,0 +1,225 @@
+import asyncio
+import logging
+import random
+import time
+import httpx
+from app.config.services_config import (
+    SERVICES,
+    CIRCUIT_WINDOW_SECONDS,
+    CIRCUIT_MIN_REQUESTS,
+    CIRCUIT_ERROR_THRESHOLD,
+    CIRCUIT_OPEN_SECONDS,
+    CIRCUIT_HALF_OPEN_MAX_CALLS,
+    RETRY_MAX_ATTEMPTS,
+    RETRY_BACKOFF_BASE,
+    RETRY_BACKOFF_MAX,
+    HEDGE_DELAY_MS,
+)
+from app.services.upstream_client import upstreams
+
+logger = logging.getLogger("api_gateway")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+RETRYABLE_STATUS = frozenset({502, 503, 504})
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose breaker is open"""
+
+    def __init__(self, service: str, retry_after: float):
+        super().__init__(f"Upstream '{service}' is unavailable (circuit open)")
+        self.service = service
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Error-rate circuit breaker over a sliding window of per-second buckets.
+
+    closed -> open when the window holds at least `min_requests` calls and
+    the failure ratio reaches `threshold`. After `open_seconds` a limited
+    number of half-open probes are let through; one success closes the
+    breaker again, one failure re-opens it.
+    """
+
+    def __init__(self, window_seconds: int, min_requests: int, threshold: float,
+                 open_seconds: float, half_open_max_calls: int):
+        self.window_seconds = max(1, window_seconds)
+        self.min_requests = min_requests
+        self.threshold = threshold
+        self.open_seconds = open_seconds
+        self.half_open_max_calls = half_open_max_calls
+        # [second, total, failures] per slot
+        self._buckets = [[0, 0, 0] for _ in range(self.window_seconds)]
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self._half_open_calls = 0
+        self.times_opened = 0
+
+    def _current_state(self) -> str:
+        if self.state == OPEN and time.monotonic() - self.opened_at >= self.open_seconds:
+            self.state = HALF_OPEN
+            self._half_open_calls = 0
+        return self.state
+
+    def allow(self) -> bool:
+        state = self._current_state()
+        if state == CLOSED:
+            return True
+        if state == HALF_OPEN and self._half_open_calls < self.half_open_max_calls:
+            self._half_open_calls += 1
+            return True
+        return False
+
+    def retry_after(self) -> float:
+        return max(0.0, self.open_seconds - (time.monotonic() - self.opened_at))
+
+    def record(self, success: bool):
+        if self.state == HALF_OPEN:
+            if success:
+                self._reset()
+            else:
+                self._trip()
+            return
+
+        second = int(time.monotonic())
+        bucket = self._buckets[second % self.window_seconds]
+        if bucket[0] != second:
+            bucket[0], bucket[1], bucket[2] = second, 0, 0
+        bucket[1] += 1
+        if not success:
+            bucket[2] += 1
+            total, failures = self._window_counts(second)
+            if total >= self.min_requests and failures / total >= self.threshold:
+                self._trip()
+
+    def _window_counts(self, now_second: int) -> tuple:
+        total = failures = 0
+        for second, count, failed in self._buckets:
+            if now_second - second < self.window_seconds:
+                total += count
+                failures += failed
+        return total, failures
+
+    def _trip(self):
+        if self.state != OPEN:
+            self.times_opened += 1
+            logger.warning("Circuit breaker opened")
+        self.state = OPEN
+        self.opened_at = time.monotonic()
+
+    def _reset(self):
+        self.state = CLOSED
+        self._buckets = [[0, 0, 0] for _ in range(self.window_seconds)]
+
+    def stats(self) -> dict:
+        total, failures = self._window_counts(int(time.monotonic()))
+        return {
+            "state": self._current_state(),
+            "window_requests": total,
+            "window_failures": failures,
+            "times_opened": self.times_opened,
+        }
+
+
+breakers = {
+    name: CircuitBreaker(
+        CIRCUIT_WINDOW_SECONDS,
+        CIRCUIT_MIN_REQUESTS,
+        CIRCUIT_ERROR_THRESHOLD,
+        CIRCUIT_OPEN_SECONDS,
+        CIRCUIT_HALF_OPEN_MAX_CALLS,
+    )
+    for name in SERVICES
+}
+
+
+def backoff_delay(attempt: int) -> float:
+    """Full-jitter exponential backoff for the given retry number (1-based)"""
+    return random.uniform(0, min(RETRY_BACKOFF_MAX, RETRY_BACKOFF_BASE * (2 ** attempt)))
+
+
+async def _hedged_send(service: str, request: httpx.Request, stream: bool) -> httpx.Response:
+    if HEDGE_DELAY_MS <= 0:
+        return await upstreams.send(service, request, stream=stream)
+    first = asyncio.create_task(upstreams.send(service, request, stream=stream))
+    done, _ = await asyncio.wait({first}, timeout=HEDGE_DELAY_MS / 1000)
+    if done:
+        return first.result()
+
+    second = asyncio.create_task(upstreams.send(service, request, stream=stream))
+    pending = {first, second}
+    error = None
+    while pending:
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            if task.exception() is None:
+                for loser in pending:
+                    loser.cancel()
+                for other in done - {task}:
+                    if other.exception() is None:
+                        await other.result().aclose()
+                return task.result()
+            error = task.exception()
+    raise error
+
+
+async def _attempt(service: str, request: httpx.Request, stream: bool, hedge: bool) -> httpx.Response:
+    breaker = breakers[service]
+    if not breaker.allow():
+        raise CircuitOpenError(service, breaker.retry_after())
+    try:
+        if hedge:
+            response = await _hedged_send(service, request, stream)
+        else:
+            response = await upstreams.send(service, request, stream=stream)
+    except httpx.HTTPError:
+        breaker.record(False)
+        raise
+    breaker.record(response.status_code < 500)
+    return response
+
+
+async def send_with_resilience(service: str, request: httpx.Request, stream: bool = False) -> httpx.Response:
+    """
+    Send a request through the service's circuit breaker
+
+    Safe methods without a body are retried with jittered exponential
+    backoff on transport errors and 502/503/504, and may be hedged.
+    Other requests get exactly one attempt.
+
+    Raises:
+        CircuitOpenError: If the breaker is open
+        httpx.HTTPError: If every attempt failed at the transport level
+    """
+    replayable = (
+        request.method in IDEMPOTENT_METHODS
+        and not request.headers.get("content-length")
+        and "transfer-encoding" not in request.headers
+    )
+    if not replayable:
+        return await _attempt(service, request, stream, hedge=False)
+
+    attempts = max(1, RETRY_MAX_ATTEMPTS)
+    for attempt in range(1, attempts + 1):
+        last = attempt == attempts
+        try:
+            response = await _attempt(service, request, stream, hedge=True)
+        except httpx.TransportError as e:
+            if last:
+                raise
+            logger.warning(f"Retrying {request.method} {request.url} after error: {str(e)}")
+        else:
+            if last or response.status_code not in RETRYABLE_STATUS:
+                return response
+            await response.aclose()
+            logger.warning(f"Retrying {request.method} {request.url} after status {response.status_code}")
+        await asyncio.sleep(backoff_delay(attempt))
+
+
+def breaker_states() -> dict:
+    return {name: breaker.stats() for name, breaker in breakers.items()}
@@ -0,0 +1,221 @@
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from fastapi import Request, Response
+from app.config.services_config import (
+    RESPONSE_CACHE_ENABLED,
+    RESPONSE_CACHE_MAX_BYTES,
+    RESPONSE_CACHE_MAX_ENTRY_BYTES,
+    RESPONSE_CACHE_TTLS,
+)
+
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+# Headers that make a response unsafe to share between clients
+_NO_STORE_DIRECTIVES = ("no-store", "private", "no-cache")
+
+
+@dataclass
+class CachedResponse:
+    status_code: int
+    raw_headers: list
+    body: bytes
+    etag: str
+    stored_at: float
+    expires_at: float
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + sum(len(n) + len(v) for n, v in self.raw_headers)
+
+
+class ResponseCache:
+    """
+    Bounded LRU cache of upstream GET responses with per-route TTLs.
+
+    Concurrent misses for the same key are coalesced so only one request
+    reaches the backend; the others wait for its result.
+    """
+
+    def __init__(self, ttls: dict, max_bytes: int, max_entry_bytes: int, enabled: bool = True):
+        # Longest prefix first so the most specific TTL wins
+        self.ttls = sorted(ttls.items(), key=lambda item: len(item[0]), reverse=True)
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self.enabled = enabled
+        self._entries: OrderedDict[tuple, CachedResponse] = OrderedDict()
+        self._inflight: dict[tuple, asyncio.Future] = {}
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.not_modified = 0
+
+    def _match(self, path: str) -> tuple | None:
+        for prefix, ttl in self.ttls:
+            if ttl > 0 and (path == prefix or path.startswith(prefix + "/")):
+                return prefix, ttl
+        return None
+
+    def ttl_for(self, request: Request) -> int | None:
+        """TTL for a request, or None if it must bypass the cache"""
+        if not self.enabled or request.method != "GET":
+            return None
+        # Personalised requests are never served from the shared cache
+        if "authorization" in request.headers or "cookie" in request.headers:
+            return None
+        if "no-cache" in request.headers.get("cache-control", ""):
+            return None
+        match = self._match(request.url.path)
+        return match[1] if match else None
+
+    @staticmethod
+    def key_for(request: Request) -> tuple:
+        return (
+            request.method,
+            request.url.path,
+            request.url.query,
+            request.headers.get("accept-encoding", ""),
+        )
+
+    def get(self, key: tuple) -> CachedResponse | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry.expires_at <= time.monotonic():
+            self._remove(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def build_entry(self, status_code: int, raw_headers: list, body: bytes, ttl: int) -> CachedResponse | None:
+        """Wrap a buffered upstream response, or return None if it may not be stored"""
+        if status_code != 200 or len(body) > self.max_entry_bytes:
+            return None
+        headers = {name.lower(): value for name, value in raw_headers}
+        cache_control = headers.get(b"cache-control", b"").decode("latin-1").lower()
+        if b"set-cookie" in headers or any(d in cache_control for d in _NO_STORE_DIRECTIVES):
+            return None
+        etag = headers.get(b"etag", b"").decode("latin-1")
+        if not etag:
+            etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+            raw_headers = raw_headers + [(b"etag", etag.encode("latin-1"))]
+        now = time.monotonic()
+        return CachedResponse(status_code, raw_headers, body, etag, now, now + ttl)
+
+    def store(self, key: tuple, entry: CachedResponse):
+        size = entry.size
+        if size > self.max_entry_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = entry
+        self._bytes += size
+        while self._bytes > self.max_bytes and self._entries:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def _remove(self, key: tuple):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def invalidate(self, path: str):
+        """Drop every entry under the cached route that a write to `path` touches"""
+        match = self._match(path)
+        if match is None:
+            return
+        prefix = match[0]
+        stale = [
+            key for key in self._entries
+            if key[1] == prefix or key[1].startswith(prefix + "/")
+        ]
+        for key in stale:
+            self._remove(key)
+        self.invalidations += len(stale)
+
+    async def coalesce(self, key: tuple, loader):
+        """
+        Run `loader` once for all concurrent callers of the same key.
+
+        Returns (result, is_leader). Followers receive the leader's result,
+        or None if the leader failed and they should fetch on their own.
+        """
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.coalesced += 1
+            return await asyncio.shield(pending), False
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await loader()
+        except BaseException:
+            future.set_result(None)
+            raise
+        else:
+            future.set_result(result)
+            return result, True
+        finally:
+            self._inflight.pop(key, None)
+
+    def respond(self, entry: CachedResponse, request: Request, status: str) -> Response:
+        """Serve an entry, answering 304 when the client already has it"""
+        age = str(int(time.monotonic() - entry.stored_at)).encode("latin-1")
+        if _etag_matches(request.headers.get("if-none-match"), entry.etag):
+            self.not_modified += 1
+            response = Response(status_code=304)
+            response.raw_headers = [
+                (b"etag", entry.etag.encode("latin-1")),
+                (b"age", age),
+                (b"x-cache", status.encode("latin-1")),
+            ]
+            return response
+        response = Response(content=entry.body, status_code=entry.status_code)
+        response.raw_headers = entry.raw_headers + [
+            (b"age", age),
+            (b"x-cache", status.encode("latin-1")),
+        ]
+        return response
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "not_modified": self.not_modified,
+        }
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison (RFC 7232 section 2.3.2)
+    bare = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == bare for tag in if_none_match.split(","))
+
+
+response_cache = ResponseCache(
+    RESPONSE_CACHE_TTLS,
+    max_bytes=RESPONSE_CACHE_MAX_BYTES,
+    max_entry_bytes=RESPONSE_CACHE_MAX_ENTRY_BYTES,
+    enabled=RESPONSE_CACHE_ENABLED,
+)
@@ -0,0 +1,148 @@
+import asyncio
+import hashlib
+import logging
+import time
+import httpx
+from collections import OrderedDict
+from jose import jwt, JWTError
+from app.config.services_config import (
+    SECRET_KEY,
+    ALGORITHM,
+    JWT_CACHE_MAX_ENTRIES,
+    JWT_CACHE_TTL,
+    JWT_REVOCATION_CHECK,
+    JWT_INTROSPECT_PATH,
+    JWT_INTROSPECT_TIMEOUT,
+)
+from app.services.upstream_client import upstreams, UpstreamNotConfigured
+from app.services.resilience import send_with_resilience, CircuitOpenError
+
+logger = logging.getLogger("api_gateway")
+
+
+class VerifiedTokenCache:
+    """
+    Bounded LRU of already-verified JWT claims, keyed by a hash of the token.
+
+    On a miss the signature is verified locally and, when revocation checks
+    are on, the user-service is asked whether the token was revoked (logout,
+    refresh-token reuse). The answer is cached for at most `ttl` seconds and
+    never past the token's own `exp`, so a revoked token stops getting
+    identity headers within `ttl`. Revoked tokens are cached as rejected
+    until they expire. If the user-service cannot answer, the locally
+    verified claims are used and the miss is retried on the next request.
+    """
+
+    def __init__(self, secret_key: str | None, algorithm: str, max_entries: int, ttl: float,
+                 revocation_check: bool):
+        self.secret_key = secret_key
+        self.algorithm = algorithm
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.revocation_check = revocation_check
+        # token digest -> (claims or None if revoked, cached until)
+        self._entries: OrderedDict[bytes, tuple] = OrderedDict()
+        # token digest -> in-flight introspection, so concurrent misses share one call
+        self._pending: dict[bytes, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.rejected = 0
+        self.revoked = 0
+        self.introspection_errors = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.secret_key)
+
+    async def verify(self, token: str) -> dict | None:
+        """
+        Return the token's claims, or None if it is invalid, expired or revoked
+        """
+        key = hashlib.sha256(token.encode("utf-8")).digest()
+        now = time.time()
+        cached = self._entries.get(key)
+        if cached is not None:
+            claims, valid_until = cached
+            if valid_until > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return claims
+            del self._entries[key]
+
+        self.misses += 1
+        try:
+            claims = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
+        except JWTError:
+            self.rejected += 1
+            return None
+
+        exp = claims.get("exp")
+        # Only access tokens are introspected; the middleware rejects the rest anyway
+        if not self.revocation_check or claims.get("type", "access") != "access":
+            active = True
+        else:
+            pending = self._pending.get(key)
+            if pending is None:
+                pending = asyncio.ensure_future(self._introspect(token))
+                self._pending[key] = pending
+                pending.add_done_callback(lambda _: self._pending.pop(key, None))
+            active = await asyncio.shield(pending)
+            if active is None:
+                # Undecided: serve the verified claims but do not cache them
+                return claims
+
+        if not active:
+            self.revoked += 1
+            if exp is not None:
+                self._store(key, None, float(exp))
+            return None
+        if exp is not None:
+            self._store(key, claims, min(float(exp), now + self.ttl))
+        return claims
+
+    async def _introspect(self, token: str) -> bool | None:
+        """True if the user-service accepts the token, False if revoked, None if it could not say"""
+        try:
+            request = upstreams.build_request(
+                "user", "GET", JWT_INTROSPECT_PATH, headers={"authorization": f"Bearer {token}"}
+            )
+            response = await asyncio.wait_for(send_with_resilience("user", request), JWT_INTROSPECT_TIMEOUT)
+        except (asyncio.TimeoutError, UpstreamNotConfigured, CircuitOpenError, httpx.HTTPError) as e:
+            self.introspection_errors += 1
+            logger.warning(f"Token introspection failed: {type(e).__name__}")
+            return None
+        if response.status_code == 401:
+            return False
+        if response.status_code >= 400:
+            self.introspection_errors += 1
+            logger.warning(f"Token introspection failed: status {response.status_code}")
+            return None
+        return True
+
+    def _store(self, key: bytes, claims: dict | None, valid_until: float):
+        self._entries[key] = (claims, valid_until)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "revocation_check": self.revocation_check,
+            "ttl_seconds": self.ttl,
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "rejected": self.rejected,
+            "revoked": self.revoked,
+            "introspection_errors": self.introspection_errors,
+        }
+
+
+token_cache = VerifiedTokenCache(
+    SECRET_KEY,
+    ALGORITHM or "HS256",
+    JWT_CACHE_MAX_ENTRIES,
+    JWT_CACHE_TTL,
+    JWT_REVOCATION_CHECK,
+)
@@ -0,0 +1,299 @@
+import asyncio
+import logging
+import random
+import time
+import httpx
+from app.config.services_config import (
+    SERVICES,
+    UPSTREAM_MAX_CONNECTIONS,
+    UPSTREAM_MAX_KEEPALIVE,
+    UPSTREAM_KEEPALIVE_EXPIRY,
+    UPSTREAM_CONNECT_TIMEOUT,
+    UPSTREAM_READ_TIMEOUT,
+    UPSTREAM_WRITE_TIMEOUT,
+    UPSTREAM_POOL_TIMEOUT,
+    UPSTREAM_HTTP2,
+    LB_STRATEGY,
+    HEALTH_CHECK_ENABLED,
+    HEALTH_CHECK_PATH,
+    HEALTH_CHECK_INTERVAL,
+    HEALTH_CHECK_TIMEOUT,
+    HEALTH_CHECK_UNHEALTHY_THRESHOLD,
+    HEALTH_CHECK_HEALTHY_THRESHOLD,
+)
+
+logger = logging.getLogger("api_gateway")
+
+# Smoothing factor for the per-replica latency moving average
+_EWMA_ALPHA = 0.2
+
+
+class UpstreamNotConfigured(Exception):
+    """Raised when a backend has no URL configured"""
+
+
+class Replica:
+    """One backend instance with its own keep-alive pool and load stats"""
+
+    def __init__(self, base_url: str, weight: float, client: httpx.AsyncClient):
+        self.base_url = httpx.URL(base_url)
+        self.weight = max(weight, 0.01)
+        self.client = client
+        self.healthy = True
+        self.in_flight = 0
+        self.requests = 0
+        self.errors = 0
+        self.latency_ewma = 0.0
+        self._consecutive_failures = 0
+        self._consecutive_successes = 0
+
+    def load(self) -> float:
+        return (self.in_flight + 1) / self.weight
+
+    def observe_latency(self, seconds: float):
+        if self.latency_ewma == 0.0:
+            self.latency_ewma = seconds
+        else:
+            self.latency_ewma += _EWMA_ALPHA * (seconds - self.latency_ewma)
+
+    def record_health(self, ok: bool) -> bool:
+        """Update health-check streaks; returns True if the healthy flag changed"""
+        if ok:
+            self._consecutive_successes += 1
+            self._consecutive_failures = 0
+            if not self.healthy and self._consecutive_successes >= HEALTH_CHECK_HEALTHY_THRESHOLD:
+                self.healthy = True
+                return True
+        else:
+            self._consecutive_failures += 1
+            self._consecutive_successes = 0
+            if self.healthy and self._consecutive_failures >= HEALTH_CHECK_UNHEALTHY_THRESHOLD:
+                self.healthy = False
+                return True
+        return False
+
+    def stats(self) -> dict:
+        return {
+            "base_url": str(self.base_url),
+            "weight": self.weight,
+            "healthy": self.healthy,
+            "in_flight": self.in_flight,
+            "requests_total": self.requests,
+            "errors_total": self.errors,
+            "latency_ewma_ms": round(self.latency_ewma * 1000, 2),
+            **_pool_stats(self.client),
+        }
+
+
+class _TrackedStream(httpx.AsyncByteStream):
+    """Keeps a replica's in-flight count until a streamed body is closed"""
+
+    def __init__(self, stream, on_close):
+        self._stream = stream
+        self._on_close = on_close
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self):
+        try:
+            await self._stream.aclose()
+        finally:
+            if self._on_close is not None:
+                self._on_close()
+                self._on_close = None
+
+
+class UpstreamClientRegistry:
+    """
+    Keeps one keep-alive httpx.AsyncClient per backend replica.
+
+    Clients are created on app startup and closed on shutdown, so every
+    proxied call reuses pooled connections instead of doing a fresh
+    TCP/TLS handshake. Each send picks a replica with the configured
+    balancing strategy; a background task health-checks every replica and
+    ejects or re-admits it.
+    """
+
+    def __init__(self, services: dict, strategy: str = "p2c"):
+        self.services = {name: replicas for name, replicas in services.items() if replicas}
+        self.strategy = strategy
+        self._replicas: dict[str, list[Replica]] = {}
+        self._health_task: asyncio.Task | None = None
+        self.limits = httpx.Limits(
+            max_connections=UPSTREAM_MAX_CONNECTIONS,
+            max_keepalive_connections=UPSTREAM_MAX_KEEPALIVE,
+            keepalive_expiry=UPSTREAM_KEEPALIVE_EXPIRY,
+        )
+        self.timeout = httpx.Timeout(
+            connect=UPSTREAM_CONNECT_TIMEOUT,
+            read=UPSTREAM_READ_TIMEOUT,
+            write=UPSTREAM_WRITE_TIMEOUT,
+            pool=UPSTREAM_POOL_TIMEOUT,
+        )
+        self.http2 = UPSTREAM_HTTP2 and _http2_available()
+
+    async def startup(self):
+        for name, replicas in self.services.items():
+            self._replicas[name] = [
+                Replica(
+                    base_url,
+                    weight,
+                    httpx.AsyncClient(
+                        base_url=base_url,
+                        limits=self.limits,
+                        timeout=self.timeout,
+                        http2=self.http2,
+                    ),
+                )
+                for base_url, weight in replicas
+            ]
+        logger.info(f"Upstream clients started: {', '.join(self._replicas) or 'none'}")
+        if HEALTH_CHECK_ENABLED and self._replicas:
+            self._health_task = asyncio.create_task(self._health_loop())
+
+    async def shutdown(self):
+        if self._health_task is not None:
+            self._health_task.cancel()
+            try:
+                await self._health_task
+            except asyncio.CancelledError:
+                pass
+            self._health_task = None
+        for name, replicas in self._replicas.items():
+            for replica in replicas:
+                try:
+                    await replica.client.aclose()
+                except Exception as e:
+                    logger.error(f"Error closing upstream client {name} ({replica.base_url}): {str(e)}")
+        self._replicas.clear()
+
+    def _replicas_for(self, name: str) -> list[Replica]:
+        try:
+            return self._replicas[name]
+        except KeyError:
+            raise UpstreamNotConfigured(f"Upstream '{name}' is not configured")
+
+    def build_request(self, name: str, method: str, url: str, **kwargs) -> httpx.Request:
+        """Build a request for a backend; the replica is chosen when it is sent"""
+        return self._replicas_for(name)[0].client.build_request(method, url, **kwargs)
+
+    def pick(self, name: str) -> Replica:
+        replicas = self._replicas_for(name)
+        if len(replicas) == 1:
+            return replicas[0]
+        # If every replica is ejected, keep serving from all of them rather than failing
+        candidates = [r for r in replicas if r.healthy] or replicas
+        if len(candidates) == 1:
+            return candidates[0]
+        if self.strategy == "least_outstanding":
+            lowest = min(r.load() for r in candidates)
+            return random.choice([r for r in candidates if r.load() == lowest])
+        # Power of two choices over a weighted sample
+        first, second = random.choices(candidates, weights=[r.weight for r in candidates], k=2)
+        if first is second:
+            return first
+        return min((first, second), key=lambda r: (r.load(), r.latency_ewma))
+
+    async def send(self, name: str, request: httpx.Request, stream: bool = False) -> httpx.Response:
+        """Send a prebuilt request to one replica of the backend, tracking utilization"""
+        replica = self.pick(name)
+        target = _retarget(request, replica.base_url)
+        replica.in_flight += 1
+        replica.requests += 1
+        released = False
+
+        def release():
+            nonlocal released
+            if not released:
+                released = True
+                replica.in_flight -= 1
+
+        start = time.perf_counter()
+        try:
+            response = await replica.client.send(target, stream=stream)
+        except BaseException as e:
+            if isinstance(e, httpx.HTTPError):
+                replica.errors += 1
+            release()
+            raise
+        replica.observe_latency(time.perf_counter() - start)
+        if response.status_code >= 500:
+            replica.errors += 1
+        if stream:
+            response.stream = _TrackedStream(response.stream, release)
+        else:
+            release()
+        return response
+
+    async def _health_loop(self):
+        while True:
+            await asyncio.sleep(HEALTH_CHECK_INTERVAL)
+            checks = [
+                self._check(name, replica)
+                for name, replicas in self._replicas.items()
+                for replica in replicas
+            ]
+            await asyncio.gather(*checks)
+
+    async def _check(self, name: str, replica: Replica):
+        try:
+            response = await replica.client.get(HEALTH_CHECK_PATH, timeout=HEALTH_CHECK_TIMEOUT)
+            ok = response.status_code < 500
+        except httpx.HTTPError:
+            ok = False
+        if replica.record_health(ok):
+            state = "re-admitted" if replica.healthy else "ejected"
+            logger.warning(f"Upstream {name} replica {replica.base_url} {state}")
+
+    def stats(self) -> dict:
+        return {
+            name: {
+                "strategy": self.strategy,
+                "http2": self.http2,
+                "max_connections_per_replica": self.limits.max_connections,
+                "healthy_replicas": sum(1 for r in replicas if r.healthy),
+                "replicas": [replica.stats() for replica in replicas],
+            }
+            for name, replicas in self._replicas.items()
+        }
+
+
+def _retarget(request: httpx.Request, base_url: httpx.URL) -> httpx.Request:
+    """Copy a request onto another replica, leaving the original reusable for retries"""
+    if (request.url.scheme, request.url.host, request.url.port) == (base_url.scheme, base_url.host, base_url.port):
+        return request
+    url = request.url.copy_with(scheme=base_url.scheme, host=base_url.host, port=base_url.port)
+    headers = [(k, v) for k, v in request.headers.raw if k.lower() != b"host"]
+    return httpx.Request(
+        request.method,
+        url,
+        headers=headers,
+        stream=request.stream,
+        extensions=request.extensions,
+    )
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        logger.warning("UPSTREAM_HTTP2 is enabled but 'h2' is not installed, falling back to HTTP/1.1")
+        return False
+
+
+def _pool_stats(client: httpx.AsyncClient) -> dict:
+    # httpx does not expose pool state publicly; read it best-effort from httpcore
+    pool = getattr(getattr(client, "_transport", None), "_pool", None)
+    connections = list(getattr(pool, "connections", []) or [])
+    idle = sum(1 for conn in connections if conn.is_idle())
+    return {
+        "connections_open": len(connections),
+        "connections_idle": idle,
+        "connections_active": len(connections) - idle,
+    }
+
+
+upstreams = UpstreamClientRegistry(SERVICES, LB_STRATEGY)
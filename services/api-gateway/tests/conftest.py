@@ -0,0 +1,14 @@
+import os
+
+# Settings are read when app.config is imported, so they must be in place first
+os.environ.update({
+    "SECRET_KEY": "gateway-test-secret",
+    "ALGORITHM": "HS256",
+    "RATE_LIMIT": "3",
+    "RATE_LIMIT_KEY": "subject",
+    "RATE_LIMIT_BACKEND": "memory",
+    "JWT_REVOCATION_CHECK": "false",
+    "RESPONSE_CACHE_ENABLED": "false",
+    "COMPRESSION_ENABLED": "false",
+    "HEALTH_CHECK_ENABLED": "false",
+})
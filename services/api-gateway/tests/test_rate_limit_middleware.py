@@ -0,0 +1,76 @@
+"""
+Rate-limit keying in the gateway middleware stack
+
+Run from services/api-gateway:
+    pip install -r requirements-dev.txt
+    python -m pytest tests
+"""
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from jose import jwt
+
+from app.main import app
+from app.services.rate_limiter import rate_limiter
+from app.services.token_cache import token_cache
+
+SECRET_KEY = "gateway-test-secret"
+# Any non-exempt path works: limiting happens before routing or proxying
+PATH = "/bookings/1"
+
+
+def _token(sub: str, secret: str = SECRET_KEY) -> str:
+    return jwt.encode({"sub": sub, "exp": time.time() + 600, "type": "access"}, secret, algorithm="HS256")
+
+
+@pytest.fixture
+def client():
+    rate_limiter.backend._buckets.clear()
+    token_cache._entries.clear()
+    # No lifespan: upstreams are not started, so proxied calls fail after the middleware
+    return TestClient(app, raise_server_exceptions=False)
+
+
+def _bucket_keys() -> list:
+    return list(rate_limiter.backend._buckets)
+
+
+def test_forged_subjects_share_the_client_ip_bucket(client):
+    statuses = [
+        client.get(PATH, headers={"Authorization": f"Bearer {_token(f'forged-{i}', 'wrong-secret')}"}).status_code
+        for i in range(6)
+    ]
+
+    # Burst of 3 rejected as unauthenticated, then the shared bucket is empty
+    assert statuses == [401, 401, 401, 429, 429, 429]
+    assert _bucket_keys() == ["default:ip:testclient"]
+
+
+def test_unsigned_payload_is_never_used_as_a_key(client):
+    # Valid signature under a different key, and a token with no signature at all
+    unsigned = ".".join(_token("forged-unsigned").split(".")[:2]) + "."
+    for token in (_token("forged-other", "other-secret"), unsigned):
+        client.get(PATH, headers={"Authorization": f"Bearer {token}"})
+
+    assert all(":sub:" not in key for key in _bucket_keys())
+    assert _bucket_keys() == ["default:ip:testclient"]
+
+
+def test_verified_subjects_get_their_own_buckets(client):
+    alice = {"Authorization": f"Bearer {_token('alice@example.com')}"}
+    bob = {"Authorization": f"Bearer {_token('bob@example.com')}"}
+
+    alice_statuses = [client.get(PATH, headers=alice).status_code for _ in range(4)]
+    bob_status = client.get(PATH, headers=bob).status_code
+
+    assert alice_statuses[:3] != [429] * 3 and alice_statuses[3] == 429
+    assert bob_status != 429
+    assert sorted(_bucket_keys()) == ["default:sub:alice@example.com", "default:sub:bob@example.com"]
+
+
+def test_anonymous_requests_are_keyed_by_ip(client):
+    statuses = [client.get(PATH).status_code for _ in range(4)]
+
+    assert statuses[3] == 429
+    assert _bucket_keys() == ["default:ip:testclient"]
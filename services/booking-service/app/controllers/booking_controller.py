@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Optional
 from sqlalchemy.orm import Session
 from app.schemas.booking import BookingCreate, BookingUpdate
 from app.database.database import get_db
@@ -11,8 +12,12 @@ def create_booking_controller(booking: BookingCreate, db: Session = Depends(get_
     return create_booking(db, booking.user_id, booking.hotel_id, booking.check_in_date, booking.check_out_date)
 
 @router.get("/")
-def get_bookings_controller(db: Session = Depends(get_db)):
-    return get_all_bookings(db)
+def get_bookings_controller(
+    skip: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    db: Session = Depends(get_db)
+):
+    return get_all_bookings(db, skip, limit)
 
 @router.get("/{booking_id}")
 def get_booking_controller(booking_id: int, db: Session = Depends(get_db)):
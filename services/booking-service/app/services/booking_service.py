@@ -9,8 +9,12 @@ def create_booking(db: Session, user_id: int, hotel_id: int, check_in_date: date
     db.refresh(booking)
     return booking
 
-def get_all_bookings(db: Session):
-    return db.query(Booking).all()
+def get_all_bookings(db: Session, skip: int = 0, limit: int | None = None):
+    # Ordered by id so skip/limit pages are stable; no limit returns every booking
+    query = db.query(Booking).order_by(Booking.id).offset(skip)
+    if limit is not None:
+        query = query.limit(limit)
+    return query.all()
 
 def get_booking_by_id(db: Session, booking_id: int):
     return db.query(Booking).filter(Booking.id == booking_id).first()
@@ -0,0 +1,30 @@
+"""Cascade room deletes
+
+Revision ID: 3e8a5c1f9d62
+Revises: b61d8e4f3a07
+Create Date: 2026-10-18 16:12:05.418630
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3e8a5c1f9d62'
+down_revision: Union[str, Sequence[str], None] = 'b61d8e4f3a07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_constraint('rooms_hotel_id_fkey', 'rooms', type_='foreignkey')
+    op.create_foreign_key('rooms_hotel_id_fkey', 'rooms', 'hotels', ['hotel_id'], ['id'], ondelete='CASCADE')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('rooms_hotel_id_fkey', 'rooms', type_='foreignkey')
+    op.create_foreign_key('rooms_hotel_id_fkey', 'rooms', 'hotels', ['hotel_id'], ['id'])
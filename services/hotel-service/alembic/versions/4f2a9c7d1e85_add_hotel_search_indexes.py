@@ -0,0 +1,43 @@
+"""Add hotel search indexes
+
+Revision ID: 4f2a9c7d1e85
+Revises: d18e2394bb8e
+Create Date: 2026-10-18 13:05:41.250913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4f2a9c7d1e85'
+down_revision: Union[str, Sequence[str], None] = 'd18e2394bb8e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Must stay identical to SEARCH_DOCUMENT_SQL in app/models/hotel.py for the planner to use it
+SEARCH_DOCUMENT_SQL = "to_tsvector('english'::regconfig, coalesce(name, '') || ' ' || coalesce(description, ''))"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index('ix_hotels_search_document', 'hotels', [sa.text(SEARCH_DOCUMENT_SQL)],
+                        postgresql_using='gin', postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_hotels_city_lower', 'hotels', [sa.text('lower(city)')],
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_hotels_rating', 'hotels', ['rating'],
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_rooms_hotel_id_price', 'rooms', ['hotel_id', 'price'],
+                        postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_rooms_hotel_id_price', table_name='rooms', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_hotels_rating', table_name='hotels', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_hotels_city_lower', table_name='hotels', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_hotels_search_document', table_name='hotels', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,35 @@
+"""Add hotel keyset pagination indexes
+
+Revision ID: 7c3e5b0a2f19
+Revises: 4f2a9c7d1e85
+Create Date: 2026-10-18 14:22:08.913374
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c3e5b0a2f19'
+down_revision: Union[str, Sequence[str], None] = '4f2a9c7d1e85'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index('ix_hotels_name_id', 'hotels', ['name', 'id'],
+                        postgresql_concurrently=True, if_not_exists=True)
+        # Same expression as the rating sort key in hotel_service.HOTEL_SORTS
+        op.create_index('ix_hotels_rating_id', 'hotels', [sa.text('coalesce(rating, 0.0)'), 'id'],
+                        postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_hotels_rating_id', table_name='hotels', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_hotels_name_id', table_name='hotels', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,31 @@
+"""Add room listing index
+
+Revision ID: b61d8e4f3a07
+Revises: 7c3e5b0a2f19
+Create Date: 2026-10-18 15:48:27.604192
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b61d8e4f3a07'
+down_revision: Union[str, Sequence[str], None] = '7c3e5b0a2f19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index('ix_rooms_hotel_type_price', 'rooms', ['hotel_id', 'room_type', 'price'],
+                        postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_rooms_hotel_type_price', table_name='rooms', postgresql_concurrently=True, if_exists=True)
@@ -1,9 +1,11 @@
 from fastapi import FastAPI
-from app.routes import hotel_routes
+from app.routes import hotel_routes, room_routes
+from app.utils.cache import hotel_cache
 
 app = FastAPI(title="Hotel Service", version="1.0.0")
 
 app.include_router(hotel_routes.router)
+app.include_router(room_routes.router)
 
 @app.get("/")
 def health_check():
@@ -12,3 +14,7 @@ def health_check():
 @app.get("/health")
 def health():
     return {"status": "healthy"}
+
+@app.get("/health/cache")
+def cache_stats():
+    return hotel_cache.stats()
@@ -1,6 +1,9 @@
-from sqlalchemy import Column, Integer, String, Float, Text
+from sqlalchemy import Column, Integer, String, Float, Text, Index, func, literal_column, text
 from app.database.database import Base
 
+# Text searched by /hotels/search; must match the expression of ix_hotels_search_document
+SEARCH_DOCUMENT_SQL = "to_tsvector('english'::regconfig, coalesce(name, '') || ' ' || coalesce(description, ''))"
+
 class Hotel(Base):
     __tablename__ = "hotels"
 
@@ -10,3 +13,15 @@ class Hotel(Base):
     address = Column(Text, nullable=False)
     rating = Column(Float, default=0.0)
     description = Column(Text, nullable=True)
+
+    __table_args__ = (
+        Index("ix_hotels_search_document", text(SEARCH_DOCUMENT_SQL), postgresql_using="gin"),
+        Index("ix_hotels_city_lower", func.lower(city)),
+        Index("ix_hotels_rating", "rating"),
+        # Keyset pagination for list_hotels; ix_hotels_id covers sort=id
+        Index("ix_hotels_name_id", "name", "id"),
+        Index("ix_hotels_rating_id", func.coalesce(rating, 0.0), "id"),
+    )
+
+
+search_document = literal_column(SEARCH_DOCUMENT_SQL)
@@ -1,15 +1,23 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, Index
+from sqlalchemy.orm import relationship, backref
 from app.database.database import Base
 
 class Room(Base):
     __tablename__ = "rooms"
 
     id = Column(Integer, primary_key=True, index=True)
-    hotel_id = Column(Integer, ForeignKey("hotels.id"), nullable=False)
+    hotel_id = Column(Integer, ForeignKey("hotels.id", ondelete="CASCADE"), nullable=False)
     room_number = Column(String, nullable=False)
     room_type = Column(String, nullable=False)  # e.g., single, double, suite
     price = Column(Float, nullable=False)
     availability = Column(Integer, default=1)  # 1 = available, 0 = booked
 
-    hotel = relationship("Hotel", backref="rooms")
+    # Deleting a hotel deletes its rooms; the database cascade does the work
+    hotel = relationship("Hotel", backref=backref("rooms", cascade="all, delete-orphan", passive_deletes=True))
+
+    __table_args__ = (
+        # Price-range filtering per hotel in /hotels/search
+        Index("ix_rooms_hotel_id_price", "hotel_id", "price"),
+        # Per-hotel room listing filtered by type and price
+        Index("ix_rooms_hotel_type_price", "hotel_id", "room_type", "price"),
+    )
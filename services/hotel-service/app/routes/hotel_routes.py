@@ -1,8 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from typing import Literal, Optional
 from sqlalchemy.orm import Session
 from app.database.database import get_db
-from app.schemas.hotel_schema import HotelCreate, HotelUpdate, HotelResponse
-from app.services.hotel_service import create_hotel, get_hotel, get_hotels, update_hotel, delete_hotel
+from app.schemas.hotel_schema import HotelCreate, HotelUpdate, HotelResponse, HotelDetailResponse, HotelSearchResponse
+from app.services.hotel_service import (
+    create_hotel, get_hotels, update_hotel, delete_hotel, search_hotels,
+    get_hotel_json, get_hotel_detail, hotel_details, parse_includes
+)
 
 router = APIRouter(prefix="/hotels", tags=["Hotels"])
 
@@ -10,16 +14,63 @@ router = APIRouter(prefix="/hotels", tags=["Hotels"])
 def create_new_hotel(hotel: HotelCreate, db: Session = Depends(get_db)):
     return create_hotel(db, hotel)
 
-@router.get("/", response_model=list[HotelResponse])
-def list_hotels(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return get_hotels(db, skip, limit)
+INCLUDE_DESCRIPTION = "Comma-separated extras: rooms (eager-loaded), summary (min price and room count per type)"
 
-@router.get("/{hotel_id}", response_model=HotelResponse)
-def get_single_hotel(hotel_id: int, db: Session = Depends(get_db)):
-    db_hotel = get_hotel(db, hotel_id)
-    if not db_hotel:
+# exclude_unset keeps rooms/summary out of the body unless they were requested
+@router.get("/", response_model=list[HotelDetailResponse], response_model_exclude_unset=True)
+def list_hotels(
+    response: Response,
+    skip: int = Query(0, ge=0, description="Offset paging; ignored when cursor is given"),
+    limit: int = Query(100, ge=1, le=500),
+    sort: Literal["id", "name", "rating"] = "id",
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
+    include: Optional[str] = Query(None, description=INCLUDE_DESCRIPTION),
+    db: Session = Depends(get_db)
+):
+    try:
+        includes = parse_includes(include)
+        hotels, next_cursor = get_hotels(db, skip, limit, sort, cursor, with_rooms="rooms" in includes)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    # Body stays a plain list for existing clients; the cursor travels in a header
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return hotel_details(db, hotels, includes)
+
+# Declared before /{hotel_id} so "search" is not parsed as an id
+@router.get("/search", response_model=HotelSearchResponse)
+def search(
+    city: Optional[str] = None,
+    min_rating: Optional[float] = Query(None, ge=0, le=5),
+    min_price: Optional[float] = Query(None, ge=0),
+    max_price: Optional[float] = Query(None, ge=0),
+    q: Optional[str] = Query(None, min_length=1, max_length=200, description="Full-text search over name and description"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    return search_hotels(db, city, min_rating, min_price, max_price, q, skip, limit)
+
+@router.get("/{hotel_id}", response_model=HotelDetailResponse, response_model_exclude_unset=True)
+def get_single_hotel(
+    hotel_id: int,
+    include: Optional[str] = Query(None, description=INCLUDE_DESCRIPTION),
+    db: Session = Depends(get_db)
+):
+    try:
+        includes = parse_includes(include)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if includes:
+        db_hotel = get_hotel_detail(db, hotel_id, includes)
+        if not db_hotel:
+            raise HTTPException(status_code=404, detail="Hotel not found")
+        return db_hotel
+    # Cached bytes are returned as-is, skipping response_model serialization
+    body = get_hotel_json(db, hotel_id)
+    if body is None:
         raise HTTPException(status_code=404, detail="Hotel not found")
-    return db_hotel
+    return Response(content=body, media_type="application/json")
 
 @router.put("/{hotel_id}", response_model=HotelResponse)
 def update_existing_hotel(hotel_id: int, hotel: HotelUpdate, db: Session = Depends(get_db)):
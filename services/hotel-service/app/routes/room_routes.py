@@ -0,0 +1,65 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from typing import Optional
+from sqlalchemy.orm import Session
+from app.database.database import get_db
+from app.schemas.room_schema import RoomCreate, RoomUpdate, RoomBulkCreate, RoomBulkCreateResponse, RoomResponse
+from app.services.hotel_service import get_hotel_rooms_json
+from app.services.room_service import (
+    hotel_exists, get_room, list_rooms, create_room, bulk_create_rooms, update_room, delete_room
+)
+
+router = APIRouter(prefix="/hotels/{hotel_id}/rooms", tags=["Rooms"])
+
+@router.get("/", response_model=list[RoomResponse])
+def list_hotel_rooms(
+    hotel_id: int,
+    room_type: Optional[str] = None,
+    min_price: Optional[float] = Query(None, ge=0),
+    max_price: Optional[float] = Query(None, ge=0),
+    available: Optional[bool] = None,
+    db: Session = Depends(get_db)
+):
+    if room_type is None and min_price is None and max_price is None and available is None:
+        # Unfiltered listing is served from the hotel cache as pre-serialized bytes
+        body = get_hotel_rooms_json(db, hotel_id)
+        if body is None:
+            raise HTTPException(status_code=404, detail="Hotel not found")
+        return Response(content=body, media_type="application/json")
+    if not hotel_exists(db, hotel_id):
+        raise HTTPException(status_code=404, detail="Hotel not found")
+    return list_rooms(db, hotel_id, room_type, min_price, max_price, available)
+
+@router.post("/", response_model=RoomResponse, status_code=status.HTTP_201_CREATED)
+def create_new_room(hotel_id: int, room: RoomCreate, db: Session = Depends(get_db)):
+    db_room = create_room(db, hotel_id, room)
+    if not db_room:
+        raise HTTPException(status_code=404, detail="Hotel not found")
+    return db_room
+
+@router.post("/bulk", response_model=RoomBulkCreateResponse, status_code=status.HTTP_201_CREATED)
+def create_rooms_in_bulk(hotel_id: int, payload: RoomBulkCreate, db: Session = Depends(get_db)):
+    created = bulk_create_rooms(db, hotel_id, payload.rooms)
+    if created is None:
+        raise HTTPException(status_code=404, detail="Hotel not found")
+    return {"hotel_id": hotel_id, "created": created}
+
+@router.get("/{room_id}", response_model=RoomResponse)
+def get_single_room(hotel_id: int, room_id: int, db: Session = Depends(get_db)):
+    db_room = get_room(db, hotel_id, room_id)
+    if not db_room:
+        raise HTTPException(status_code=404, detail="Room not found")
+    return db_room
+
+@router.put("/{room_id}", response_model=RoomResponse)
+def update_existing_room(hotel_id: int, room_id: int, room: RoomUpdate, db: Session = Depends(get_db)):
+    db_room = update_room(db, hotel_id, room_id, room)
+    if not db_room:
+        raise HTTPException(status_code=404, detail="Room not found")
+    return db_room
+
+@router.delete("/{room_id}", response_model=RoomResponse)
+def delete_existing_room(hotel_id: int, room_id: int, db: Session = Depends(get_db)):
+    db_room = delete_room(db, hotel_id, room_id)
+    if not db_room:
+        raise HTTPException(status_code=404, detail="Room not found")
+    return db_room
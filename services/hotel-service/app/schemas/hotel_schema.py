@@ -1,5 +1,7 @@
 from pydantic import BaseModel
 from typing import Optional, List
+# Room schemas live in room_schema; re-exported for existing imports
+from app.schemas.room_schema import RoomBase, RoomResponse
 
 class HotelBase(BaseModel):
     name: str
@@ -20,15 +22,30 @@ class HotelResponse(HotelBase):
     class Config:
         from_attributes = True
 
-class RoomBase(BaseModel):
-    room_number: str
+class RoomTypeSummary(BaseModel):
     room_type: str
-    price: float
-    availability: Optional[int] = 1
-
-class RoomResponse(RoomBase):
-    id: int
-    hotel_id: int
-
-    class Config:
-        from_attributes = True
+    room_count: int
+    min_price: float
+
+class HotelRoomSummary(BaseModel):
+    room_count: int
+    min_price: Optional[float] = None
+    by_type: List[RoomTypeSummary]
+
+class HotelDetailResponse(HotelResponse):
+    # Only present when requested with include=rooms / include=summary
+    rooms: Optional[List[RoomResponse]] = None
+    summary: Optional[HotelRoomSummary] = None
+
+class FacetCount(BaseModel):
+    value: str
+    count: int
+
+class HotelSearchFacets(BaseModel):
+    city: List[FacetCount]
+    rating: List[FacetCount]
+
+class HotelSearchResponse(BaseModel):
+    total: int
+    hotels: List[HotelResponse]
+    facets: HotelSearchFacets
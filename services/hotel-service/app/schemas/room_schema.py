@@ -1,14 +1,40 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field, field_validator
+from typing import List, Optional
+
+# Upper bound for one bulk-create request
+MAX_BULK_ROOMS = 5000
 
 class RoomBase(BaseModel):
     room_number: str
     room_type: str
-    price_per_night: float
-    is_available: Optional[bool] = True
+    price: float
+    availability: Optional[int] = 1
 
 class RoomCreate(RoomBase):
+    price: float = Field(..., ge=0)
+
+class RoomUpdate(BaseModel):
+    room_number: Optional[str] = None
+    room_type: Optional[str] = None
+    price: Optional[float] = Field(None, ge=0)
+    availability: Optional[int] = None
+
+class RoomBulkCreate(BaseModel):
+    rooms: List[RoomCreate] = Field(..., min_length=1, max_length=MAX_BULK_ROOMS)
+
+    @field_validator("rooms")
+    @classmethod
+    def unique_room_numbers(cls, rooms: List[RoomCreate]) -> List[RoomCreate]:
+        seen = set()
+        for room in rooms:
+            if room.room_number in seen:
+                raise ValueError(f"Duplicate room_number in request: {room.room_number}")
+            seen.add(room.room_number)
+        return rooms
+
+class RoomBulkCreateResponse(BaseModel):
     hotel_id: int
+    created: int
 
 class RoomResponse(RoomBase):
     id: int
@@ -1,6 +1,15 @@
-from sqlalchemy.orm import Session
-from app.models.hotel import Hotel
-from app.schemas.hotel_schema import HotelCreate, HotelUpdate
+import base64
+import json
+from sqlalchemy import select, exists, func, tuple_
+from typing import List
+from pydantic import TypeAdapter
+from sqlalchemy.orm import Session, selectinload
+from app.models.hotel import Hotel, search_document
+from app.models.room import Room
+from app.schemas.hotel_schema import HotelCreate, HotelUpdate, HotelResponse, HotelDetailResponse, RoomResponse
+from app.utils.cache import hotel_cache
+
+_rooms_adapter = TypeAdapter(List[RoomResponse])
 
 def create_hotel(db: Session, hotel: HotelCreate):
     db_hotel = Hotel(**hotel.dict())
@@ -12,8 +21,162 @@ def create_hotel(db: Session, hotel: HotelCreate):
 def get_hotel(db: Session, hotel_id: int):
     return db.query(Hotel).filter(Hotel.id == hotel_id).first()
 
-def get_hotels(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(Hotel).offset(skip).limit(limit).all()
+def hotel_cache_keys(hotel_id: int):
+    return f"hotel:{hotel_id}", f"rooms:{hotel_id}"
+
+def invalidate_hotel_cache(hotel_id: int):
+    hotel_cache.invalidate(*hotel_cache_keys(hotel_id))
+
+def invalidate_rooms_cache(hotel_id: int):
+    hotel_cache.invalidate(hotel_cache_keys(hotel_id)[1])
+
+def get_hotel_json(db: Session, hotel_id: int) -> bytes | None:
+    """Serialized HotelResponse for one hotel, read through the cache; None if missing"""
+    def load():
+        db_hotel = get_hotel(db, hotel_id)
+        if not db_hotel:
+            return None
+        return HotelResponse.model_validate(db_hotel).model_dump_json().encode("utf-8")
+    return hotel_cache.get_or_load(hotel_cache_keys(hotel_id)[0], load)
+
+def get_hotel_rooms_json(db: Session, hotel_id: int) -> bytes | None:
+    """Serialized list of a hotel's rooms, read through the cache; None if the hotel is missing"""
+    def load():
+        rooms = db.query(Room).filter(Room.hotel_id == hotel_id).order_by(Room.id).all()
+        if not rooms and not db.query(exists().where(Hotel.id == hotel_id)).scalar():
+            return None
+        return _rooms_adapter.dump_json(rooms)
+    return hotel_cache.get_or_load(hotel_cache_keys(hotel_id)[1], load)
+
+# Listing sort orders: name -> (sort key, descending); id breaks ties in the same direction
+HOTEL_SORTS = {
+    "id": (Hotel.id, False),
+    "name": (Hotel.name, False),
+    "rating": (func.coalesce(Hotel.rating, 0.0), True),
+}
+
+# JSON type each sort's cursor key must have; none of the sort keys can be NULL
+# (name is NOT NULL, rating is coalesced), so None is never a valid key
+HOTEL_SORT_KEY_TYPES = {
+    "id": (int,),
+    "name": (str,),
+    "rating": (int, float),
+}
+
+# ids are 32-bit INTEGER columns; larger values would fail in the database
+MAX_HOTEL_ID = 2**31 - 1
+
+def _valid_cursor_value(value, types) -> bool:
+    # bool is an int subclass, but never a valid key
+    if not isinstance(value, types) or isinstance(value, bool):
+        return False
+    if isinstance(value, int) and types == (int,):
+        return -MAX_HOTEL_ID - 1 <= value <= MAX_HOTEL_ID
+    # Postgres text cannot hold NUL
+    return not (isinstance(value, str) and "\x00" in value)
+
+def encode_cursor(sort: str, key, hotel_id: int) -> str:
+    raw = json.dumps([sort, key, hotel_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str, sort: str):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort, key, hotel_id = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError):
+        raise ValueError("Malformed cursor")
+    if (cursor_sort != sort or not _valid_cursor_value(hotel_id, (int,))
+            or not _valid_cursor_value(key, HOTEL_SORT_KEY_TYPES[sort])):
+        raise ValueError("Cursor does not match the requested sort")
+    return key, hotel_id
+
+def get_hotels(db: Session, skip: int = 0, limit: int = 100, sort: str = "id", cursor: str | None = None,
+               with_rooms: bool = False):
+    """
+    One page of hotels in a stable order, plus the cursor for the next page
+
+    With a cursor the page starts right after the cursor's (sort key, id)
+    through the matching index, so deep pages cost the same as the first.
+    Without one, skip/limit OFFSET paging is kept for existing clients.
+    with_rooms loads every room of the page in one extra IN query.
+    """
+    sort_key, descending = HOTEL_SORTS[sort]
+    query = db.query(Hotel, sort_key)
+    if with_rooms:
+        query = query.options(selectinload(Hotel.rooms))
+    if cursor is not None:
+        key, last_id = decode_cursor(cursor, sort)
+        position = tuple_(sort_key, Hotel.id)
+        query = query.filter(position < tuple_(key, last_id) if descending else position > tuple_(key, last_id))
+    if descending:
+        query = query.order_by(sort_key.desc(), Hotel.id.desc())
+    else:
+        query = query.order_by(sort_key, Hotel.id)
+    if cursor is None and skip:
+        query = query.offset(skip)
+    rows = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last_hotel, last_key = rows[-1]
+        next_cursor = encode_cursor(sort, last_key, last_hotel.id)
+    return [hotel for hotel, _ in rows], next_cursor
+
+HOTEL_INCLUDES = ("rooms", "summary")
+
+def parse_includes(include: str | None) -> set:
+    includes = {part.strip() for part in (include or "").split(",") if part.strip()}
+    unknown = includes - set(HOTEL_INCLUDES)
+    if unknown:
+        raise ValueError(f"Unknown include: {', '.join(sorted(unknown))}; expected {', '.join(HOTEL_INCLUDES)}")
+    return includes
+
+def room_summaries(db: Session, hotel_ids: list[int]) -> dict:
+    """Room count and min price per type for many hotels, aggregated in SQL in one query"""
+    summaries = {hotel_id: {"room_count": 0, "min_price": None, "by_type": []} for hotel_id in hotel_ids}
+    if not hotel_ids:
+        return summaries
+    rows = db.execute(
+        select(Room.hotel_id, Room.room_type, func.count().label("room_count"), func.min(Room.price).label("min_price"))
+        .where(Room.hotel_id.in_(hotel_ids))
+        .group_by(Room.hotel_id, Room.room_type)
+        .order_by(Room.hotel_id, Room.room_type)
+    ).all()
+    for row in rows:
+        summary = summaries[row.hotel_id]
+        summary["by_type"].append({"room_type": row.room_type, "room_count": row.room_count, "min_price": row.min_price})
+        summary["room_count"] += row.room_count
+        if summary["min_price"] is None or row.min_price < summary["min_price"]:
+            summary["min_price"] = row.min_price
+    return summaries
+
+def hotel_details(db: Session, hotels: list, includes: set) -> list[HotelDetailResponse]:
+    """
+    Build responses with only the requested extras
+
+    Rooms must already be loaded (selectinload); summaries are fetched
+    here for the whole list at once. Nothing touches hotel.rooms unless
+    rooms were requested, so no lazy loads are triggered.
+    """
+    summaries = room_summaries(db, [hotel.id for hotel in hotels]) if "summary" in includes else {}
+    details = []
+    for hotel in hotels:
+        extras = {}
+        if "rooms" in includes:
+            extras["rooms"] = [RoomResponse.model_validate(room) for room in sorted(hotel.rooms, key=lambda room: room.id)]
+        if "summary" in includes:
+            extras["summary"] = summaries[hotel.id]
+        details.append(HotelDetailResponse(**HotelResponse.model_validate(hotel).model_dump(), **extras))
+    return details
+
+def get_hotel_detail(db: Session, hotel_id: int, includes: set):
+    query = db.query(Hotel).filter(Hotel.id == hotel_id)
+    if "rooms" in includes:
+        query = query.options(selectinload(Hotel.rooms))
+    db_hotel = query.first()
+    if not db_hotel:
+        return None
+    return hotel_details(db, [db_hotel], includes)[0]
 
 def update_hotel(db: Session, hotel_id: int, hotel: HotelUpdate):
     db_hotel = db.query(Hotel).filter(Hotel.id == hotel_id).first()
@@ -23,6 +186,7 @@ def update_hotel(db: Session, hotel_id: int, hotel: HotelUpdate):
         setattr(db_hotel, key, value)
     db.commit()
     db.refresh(db_hotel)
+    invalidate_hotel_cache(hotel_id)
     return db_hotel
 
 def delete_hotel(db: Session, hotel_id: int):
@@ -31,4 +195,61 @@ def delete_hotel(db: Session, hotel_id: int):
         return None
     db.delete(db_hotel)
     db.commit()
+    invalidate_hotel_cache(hotel_id)
     return db_hotel
+
+def _search_query(db: Session, city=None, min_rating=None, min_price=None, max_price=None, q=None):
+    query = db.query(Hotel)
+    if city:
+        query = query.filter(func.lower(Hotel.city) == city.lower())
+    if min_rating is not None:
+        query = query.filter(Hotel.rating >= min_rating)
+    if min_price is not None or max_price is not None:
+        # Hotels with at least one room in the price range
+        room_filter = [Room.hotel_id == Hotel.id]
+        if min_price is not None:
+            room_filter.append(Room.price >= min_price)
+        if max_price is not None:
+            room_filter.append(Room.price <= max_price)
+        query = query.filter(exists().where(*room_filter))
+    if q:
+        query = query.filter(search_document.op("@@")(func.websearch_to_tsquery("english", q)))
+    return query
+
+def _search_facets(query):
+    # City and rating-bucket counts over the filtered hotels in one GROUPING SETS query
+    filtered = query.with_entities(Hotel.city, Hotel.rating).order_by(None).subquery()
+    rating_bucket = func.floor(func.coalesce(filtered.c.rating, 0))
+    rows = query.session.execute(
+        select(
+            filtered.c.city,
+            rating_bucket.label("rating_bucket"),
+            func.grouping(filtered.c.city).label("by_rating"),
+            func.count().label("count")
+        ).group_by(func.grouping_sets(filtered.c.city, rating_bucket))
+    ).all()
+    cities = sorted(
+        ({"value": row.city, "count": row.count} for row in rows if not row.by_rating),
+        key=lambda facet: (-facet["count"], facet["value"])
+    )
+    ratings = sorted(
+        ({"value": str(int(row.rating_bucket)), "count": row.count} for row in rows if row.by_rating),
+        key=lambda facet: facet["value"],
+        reverse=True
+    )
+    return cities, ratings
+
+def search_hotels(db: Session, city=None, min_rating=None, min_price=None, max_price=None, q=None,
+                  skip: int = 0, limit: int = 20):
+    query = _search_query(db, city, min_rating, min_price, max_price, q)
+    cities, ratings = _search_facets(query)
+    if q:
+        rank = func.ts_rank(search_document, func.websearch_to_tsquery("english", q))
+        query = query.order_by(rank.desc(), Hotel.id)
+    else:
+        query = query.order_by(Hotel.rating.desc().nulls_last(), Hotel.id)
+    return {
+        "total": sum(facet["count"] for facet in cities),
+        "hotels": query.offset(skip).limit(limit).all(),
+        "facets": {"city": cities, "rating": ratings},
+    }
@@ -0,0 +1,72 @@
+from sqlalchemy import insert, exists
+from sqlalchemy.orm import Session
+from app.models.hotel import Hotel
+from app.models.room import Room
+from app.schemas.room_schema import RoomCreate, RoomUpdate
+from app.services.hotel_service import invalidate_rooms_cache
+
+def hotel_exists(db: Session, hotel_id: int) -> bool:
+    return db.query(exists().where(Hotel.id == hotel_id)).scalar()
+
+def get_room(db: Session, hotel_id: int, room_id: int):
+    return db.query(Room).filter(Room.hotel_id == hotel_id, Room.id == room_id).first()
+
+def list_rooms(db: Session, hotel_id: int, room_type=None, min_price=None, max_price=None, available=None):
+    # Equality on hotel_id/room_type plus a price range via ix_rooms_hotel_type_price; ordered by id
+    # like the cached unfiltered listing, so a filter never changes the order
+    query = db.query(Room).filter(Room.hotel_id == hotel_id)
+    if room_type is not None:
+        query = query.filter(Room.room_type == room_type)
+    if min_price is not None:
+        query = query.filter(Room.price >= min_price)
+    if max_price is not None:
+        query = query.filter(Room.price <= max_price)
+    if available is not None:
+        query = query.filter(Room.availability == (1 if available else 0))
+    return query.order_by(Room.id).all()
+
+def create_room(db: Session, hotel_id: int, room: RoomCreate):
+    if not hotel_exists(db, hotel_id):
+        return None
+    db_room = Room(hotel_id=hotel_id, **room.model_dump())
+    db.add(db_room)
+    db.commit()
+    db.refresh(db_room)
+    invalidate_rooms_cache(hotel_id)
+    return db_room
+
+def bulk_create_rooms(db: Session, hotel_id: int, rooms: list[RoomCreate]):
+    """
+    Insert many rooms with one executemany
+
+    SQLAlchemy batches the parameter sets into multi-row INSERT statements,
+    so a large property onboards in a handful of round trips and a single
+    transaction. Returns the number of rooms created, or None if the hotel
+    does not exist.
+    """
+    if not hotel_exists(db, hotel_id):
+        return None
+    db.execute(insert(Room), [{"hotel_id": hotel_id, **room.model_dump()} for room in rooms])
+    db.commit()
+    invalidate_rooms_cache(hotel_id)
+    return len(rooms)
+
+def update_room(db: Session, hotel_id: int, room_id: int, room: RoomUpdate):
+    db_room = get_room(db, hotel_id, room_id)
+    if not db_room:
+        return None
+    for key, value in room.model_dump(exclude_unset=True).items():
+        setattr(db_room, key, value)
+    db.commit()
+    db.refresh(db_room)
+    invalidate_rooms_cache(hotel_id)
+    return db_room
+
+def delete_room(db: Session, hotel_id: int, room_id: int):
+    db_room = get_room(db, hotel_id, room_id)
+    if not db_room:
+        return None
+    db.delete(db_room)
+    db.commit()
+    invalidate_rooms_cache(hotel_id)
+    return db_room
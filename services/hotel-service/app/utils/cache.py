@@ -0,0 +1,158 @@
+import os
+import time
+import logging
+import threading
+from collections import OrderedDict
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# memory: per-process LRU; redis: shared by every hotel-service replica
+HOTEL_CACHE_BACKEND = os.getenv("HOTEL_CACHE_BACKEND", "memory").lower()
+HOTEL_CACHE_TTL = int(os.getenv("HOTEL_CACHE_TTL", 300))
+HOTEL_CACHE_MAX_ENTRIES = int(os.getenv("HOTEL_CACHE_MAX_ENTRIES", 10000))
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+
+class InMemoryCacheBackend:
+    """Bounded LRU of bytes values with per-entry expiry"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple] = OrderedDict()
+        # Route handlers are sync and run on a threadpool
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes, ttl: int):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, *keys: str):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def stats(self) -> dict:
+        return {"backend": "memory", "entries": len(self._entries), "max_entries": self.max_entries}
+
+
+class RedisCacheBackend:
+    """
+    Cache shared across replicas via Redis
+
+    Invalidations from one replica are seen by all of them. Redis errors
+    are logged and treated as misses, so an outage only costs database
+    load.
+    """
+
+    def __init__(self, url: str, prefix: str = "hotel-service:"):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("HOTEL_CACHE_BACKEND=redis requires the 'redis' package")
+        self._redis = redis.Redis.from_url(url)
+        self.prefix = prefix
+        self.errors = 0
+
+    def get(self, key: str) -> bytes | None:
+        try:
+            return self._redis.get(self.prefix + key)
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Cache get failed for {key}: {str(e)}")
+            return None
+
+    def set(self, key: str, value: bytes, ttl: int):
+        try:
+            self._redis.set(self.prefix + key, value, ex=ttl)
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Cache set failed for {key}: {str(e)}")
+
+    def delete(self, *keys: str):
+        try:
+            self._redis.delete(*(self.prefix + key for key in keys))
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Cache delete failed for {', '.join(keys)}: {str(e)}")
+
+    def stats(self) -> dict:
+        return {"backend": "redis", "errors": self.errors}
+
+
+class ReadThroughCache:
+    """
+    Read-through cache of pre-serialized response bodies
+
+    Values are the exact JSON bytes returned to clients, so a hit skips
+    the query, ORM hydration and Pydantic serialization. Hits and misses
+    are counted per namespace (the key prefix before ':').
+    """
+
+    def __init__(self, backend, ttl: int):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits: dict[str, int] = {}
+        self.misses: dict[str, int] = {}
+
+    def get_or_load(self, key: str, loader) -> bytes | None:
+        """Return the cached bytes for key, or call loader() and cache a non-None result"""
+        namespace = key.split(":", 1)[0]
+        if self.ttl > 0:
+            value = self.backend.get(key)
+            if value is not None:
+                self.hits[namespace] = self.hits.get(namespace, 0) + 1
+                return value
+        self.misses[namespace] = self.misses.get(namespace, 0) + 1
+        value = loader()
+        if value is not None and self.ttl > 0:
+            self.backend.set(key, value, self.ttl)
+        return value
+
+    def invalidate(self, *keys: str):
+        self.backend.delete(*keys)
+
+    def stats(self) -> dict:
+        namespaces = {}
+        for namespace in sorted(set(self.hits) | set(self.misses)):
+            hits = self.hits.get(namespace, 0)
+            misses = self.misses.get(namespace, 0)
+            namespaces[namespace] = {
+                "hits": hits,
+                "misses": misses,
+                "hit_ratio": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+            }
+        hits = sum(self.hits.values())
+        lookups = hits + sum(self.misses.values())
+        return {
+            **self.backend.stats(),
+            "ttl_seconds": self.ttl,
+            "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+            "namespaces": namespaces,
+        }
+
+
+def create_backend():
+    if HOTEL_CACHE_BACKEND == "redis":
+        return RedisCacheBackend(REDIS_URL)
+    return InMemoryCacheBackend(HOTEL_CACHE_MAX_ENTRIES)
+
+
+hotel_cache = ReadThroughCache(create_backend(), HOTEL_CACHE_TTL)
@@ -0,0 +1,106 @@
+"""
+Hotel listing pagination benchmark: OFFSET vs keyset
+
+Seeds a large number of synthetic hotels, then times fetching page N of
+list_hotels both ways. Offset paging degrades linearly with N; keyset
+paging should stay flat. Run it against a scratch database.
+
+Usage:
+    python -m app.utils.pagination_benchmark
+    python -m app.utils.pagination_benchmark --hotels 500000 --pages 1 100 1000 5000 --sort rating
+    python -m app.utils.pagination_benchmark --keep   # leave seeded rows for the next run
+"""
+import argparse
+import random
+import statistics
+import time
+from sqlalchemy import insert, delete, func, text
+from app.database.database import SessionLocal
+from app.models.hotel import Hotel
+from app.services.hotel_service import get_hotels, encode_cursor, HOTEL_SORTS
+
+SEED_PREFIX = "bench-hotel-"
+CITIES = ["Colombo", "Kandy", "Galle", "Ella", "Negombo", "Jaffna", "Trincomalee", "Nuwara Eliya"]
+SEED_BATCH = 10000
+
+
+def seed(db, count: int):
+    existing = db.query(func.count(Hotel.id)).filter(Hotel.name.startswith(SEED_PREFIX, autoescape=True)).scalar()
+    rng = random.Random(42)
+    for start in range(existing, count, SEED_BATCH):
+        rows = [
+            {
+                "name": f"{SEED_PREFIX}{i:08d}",
+                "city": rng.choice(CITIES),
+                "address": f"{i} Benchmark Road",
+                "rating": round(rng.uniform(0, 5), 1),
+                "description": "Seeded by the pagination benchmark",
+            }
+            for i in range(start, min(start + SEED_BATCH, count))
+        ]
+        db.execute(insert(Hotel), rows)
+        db.commit()
+    # Fresh statistics so both modes get realistic plans
+    db.execute(text("ANALYZE hotels"))
+    db.commit()
+    return max(count - existing, 0)
+
+
+def cleanup(db):
+    db.execute(delete(Hotel).where(Hotel.name.startswith(SEED_PREFIX, autoescape=True)))
+    db.commit()
+
+
+def cursor_for_page(db, sort: str, page: int, limit: int) -> str | None:
+    """Cursor pointing just before `page` (1-based), found outside the timed section"""
+    if page <= 1:
+        return None
+    sort_key, descending = HOTEL_SORTS[sort]
+    order = (sort_key.desc(), Hotel.id.desc()) if descending else (sort_key, Hotel.id)
+    row = db.query(sort_key, Hotel.id).order_by(*order).offset((page - 1) * limit - 1).limit(1).first()
+    return encode_cursor(sort, row[0], row[1]) if row else None
+
+
+def time_call(fn, repeat: int) -> float:
+    fn()  # warm-up
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offset vs keyset page-N latency for list_hotels")
+    parser.add_argument("--hotels", type=int, default=200000, help="Seeded hotel rows")
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 10, 100, 1000])
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--sort", choices=sorted(HOTEL_SORTS), default="id")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--keep", action="store_true", help="Keep seeded rows afterwards")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        inserted = seed(db, args.hotels)
+        print(f"Seeded {inserted} hotels ({args.hotels} benchmark rows in total)")
+
+        print(f"\n{'page':>8} {'offset ms':>12} {'keyset ms':>12} {'speedup':>10}")
+        for page in args.pages:
+            cursor = cursor_for_page(db, args.sort, page, args.limit)
+            if page > 1 and cursor is None:
+                print(f"{page:>8} {'(past the last page)':>36}")
+                continue
+            offset_s = time_call(lambda: get_hotels(db, (page - 1) * args.limit, args.limit, args.sort), args.repeat)
+            keyset_s = time_call(lambda: get_hotels(db, 0, args.limit, args.sort, cursor), args.repeat)
+            speedup = offset_s / keyset_s if keyset_s else float("inf")
+            print(f"{page:>8} {offset_s * 1000:>12.2f} {keyset_s * 1000:>12.2f} {speedup:>9.1f}x")
+    finally:
+        if not args.keep:
+            cleanup(db)
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -22,6 +22,8 @@ from app.database.database import Base
 
 # Import ALL your models here (Alembic needs to see them)
 from app.models.user import User
+from app.models.verification_token import VerificationToken
+from app.models.revoked_token import RevokedToken
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,37 @@
+"""add admin listing indexes
+
+Revision ID: a3c91f0e7b42
+Revises: 216d6dd440d5
+Create Date: 2026-10-18 09:12:31.104522
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c91f0e7b42'
+down_revision: Union[str, Sequence[str], None] = '216d6dd440d5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = {
+    'ix_users_role_id': ['role', 'id'],
+    'ix_users_is_verified_id': ['is_verified', 'id'],
+    'ix_users_created_at_id': ['created_at', 'id'],
+}
+
+
+def upgrade() -> None:
+    # Build concurrently so the users table stays writable on large installs
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES.items():
+            op.create_index(name, 'users', columns, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name in INDEXES:
+            op.drop_index(name, table_name='users', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,43 @@
+"""add case-insensitive unique indexes on email and username
+
+Revision ID: c58e0d2a9f13
+Revises: a3c91f0e7b42
+Create Date: 2026-10-18 10:04:52.611208
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c58e0d2a9f13'
+down_revision: Union[str, Sequence[str], None] = 'a3c91f0e7b42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = {
+    'uq_users_email_lower': 'email',
+    'uq_users_username_lower': 'username',
+}
+
+
+def upgrade() -> None:
+    # Fails if existing rows differ only by case; resolve those before upgrading
+    with op.get_context().autocommit_block():
+        for name, column in INDEXES.items():
+            op.create_index(
+                name,
+                'users',
+                [sa.text(f'lower({column})')],
+                unique=True,
+                postgresql_concurrently=True,
+                if_not_exists=True
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name in INDEXES:
+            op.drop_index(name, table_name='users', postgresql_concurrently=True, if_exists=True)
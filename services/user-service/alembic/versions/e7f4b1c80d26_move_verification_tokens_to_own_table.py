@@ -0,0 +1,57 @@
+"""move verification tokens to their own table
+
+Revision ID: e7f4b1c80d26
+Revises: c58e0d2a9f13
+Create Date: 2026-10-18 11:37:09.283415
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7f4b1c80d26'
+down_revision: Union[str, Sequence[str], None] = 'c58e0d2a9f13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'email_verification_tokens',
+        sa.Column('token_hash', sa.String(length=64), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('token_hash')
+    )
+    op.create_index(op.f('ix_email_verification_tokens_user_id'), 'email_verification_tokens', ['user_id'])
+    op.create_index(op.f('ix_email_verification_tokens_expires_at'), 'email_verification_tokens', ['expires_at'])
+
+    # Carry over pending, unexpired tokens as hashes; expired ones are simply dropped
+    op.execute("""
+        INSERT INTO email_verification_tokens (token_hash, user_id, expires_at, created_at)
+        SELECT encode(sha256(convert_to(verification_token, 'UTF8')), 'hex'),
+               id, verification_token_expires, now() AT TIME ZONE 'utc'
+        FROM users
+        WHERE verification_token IS NOT NULL
+          AND is_verified = false
+          AND verification_token_expires > now() AT TIME ZONE 'utc'
+    """)
+
+    op.drop_column('users', 'verification_token_expires')
+    # Drops the unique constraint on the column with it
+    op.drop_column('users', 'verification_token')
+
+
+def downgrade() -> None:
+    # Raw tokens cannot be recovered from their hashes; pending users must request a new email
+    op.add_column('users', sa.Column('verification_token', sa.String(), nullable=True))
+    op.create_unique_constraint('users_verification_token_key', 'users', ['verification_token'])
+    op.add_column('users', sa.Column('verification_token_expires', sa.DateTime(), nullable=True))
+    op.drop_index(op.f('ix_email_verification_tokens_expires_at'), table_name='email_verification_tokens')
+    op.drop_index(op.f('ix_email_verification_tokens_user_id'), table_name='email_verification_tokens')
+    op.drop_table('email_verification_tokens')
@@ -1,5 +1,5 @@
 # app/controllers/auth_controller.py
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status, BackgroundTasks
 from app.schemas.user_schema import UserCreate, UserLogin, UserResponse
 from app.schemas.token_schema import Token
@@ -7,17 +7,20 @@ from app.services.auth_service import (
     register_user,
     login_user,
     verify_user_email,
-    resend_verification_email
+    resend_verification_email,
+    refresh_user_tokens,
+    logout_user
 )
-from app.models.user import User
+from app.utils.principal_cache import Principal
+from app.utils.password_pool import PasswordPoolBusy
 
 
 class AuthController:
     
     @staticmethod
-    def register_new_user(
+    async def register_new_user(
         user: UserCreate,
-        db: Session,
+        db: AsyncSession,
         background_tasks: BackgroundTasks
     ) -> dict:
         """
@@ -26,7 +29,7 @@ class AuthController:
         Returns success message instead of user data
         """
         try:
-            db_user = register_user(db, user, background_tasks)
+            db_user = await register_user(db, user, background_tasks)
             return {
                 "message": "User registered successfully! Please check your email to verify your account.",
                 "email": db_user.email,
@@ -38,6 +41,12 @@ class AuthController:
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=str(e)
             )
+        except PasswordPoolBusy as e:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=str(e),
+                headers={"Retry-After": "1"}
+            )
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -45,12 +54,12 @@ class AuthController:
             )
     
     @staticmethod
-    def verify_email(token: str, db: Session, background_tasks: BackgroundTasks) -> dict:
+    async def verify_email(token: str, db: AsyncSession, background_tasks: BackgroundTasks) -> dict:
         """
         Verify user email with token
         """
         try:
-            return verify_user_email(db, token, background_tasks)
+            return await verify_user_email(db, token, background_tasks)
         except ValueError as e:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -63,12 +72,12 @@ class AuthController:
             )
     
     @staticmethod
-    def resend_verification(email: str, db: Session, background_tasks: BackgroundTasks) -> dict:
+    async def resend_verification(email: str, db: AsyncSession, background_tasks: BackgroundTasks) -> dict:
         """
         Resend verification email to user
         """
         try:
-            return resend_verification_email(db, email, background_tasks)
+            return await resend_verification_email(db, email, background_tasks)
         except ValueError as e:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -81,23 +90,23 @@ class AuthController:
             )
     
     @staticmethod
-    def authenticate_user(user: UserLogin, db: Session) -> Token:
+    async def authenticate_user(user: UserLogin, db: AsyncSession, background_tasks: BackgroundTasks) -> Token:
         """
         Authenticate user and return JWT token
         
         Raises HTTPException if email not verified
         """
         try:
-            token = login_user(db, user)
+            tokens = await login_user(db, user, background_tasks)
             
-            if not token:
+            if not tokens:
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
                     detail="Invalid email or password",
                     headers={"WWW-Authenticate": "Bearer"}
                 )
             
-            return Token(access_token=token, token_type="bearer")
+            return Token(token_type="bearer", **tokens)
             
         except ValueError as e:
             # Handle unverified email error
@@ -107,6 +116,12 @@ class AuthController:
             )
         except HTTPException:
             raise
+        except PasswordPoolBusy as e:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=str(e),
+                headers={"Retry-After": "1"}
+            )
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -114,7 +129,35 @@ class AuthController:
             )
     
     @staticmethod
-    def get_user_profile(current_user: User) -> UserResponse:
+    async def refresh_tokens(refresh_token: str, db: AsyncSession) -> Token:
+        """
+        Exchange a refresh token for a new token pair
+        """
+        try:
+            tokens = await refresh_user_tokens(db, refresh_token)
+            return Token(token_type="bearer", **tokens)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail=str(e),
+                headers={"WWW-Authenticate": "Bearer"}
+            )
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="An error occurred while refreshing the token"
+            )
+    
+    @staticmethod
+    async def logout(access_payload: dict, refresh_token: str | None, db: AsyncSession) -> dict:
+        """
+        Revoke the current access token, and the refresh token if given
+        """
+        await logout_user(db, access_payload, refresh_token)
+        return {"message": "Logged out successfully"}
+    
+    @staticmethod
+    def get_user_profile(current_user: Principal) -> UserResponse:
         """
         Get current user profile
         """
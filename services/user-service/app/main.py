@@ -1,14 +1,49 @@
+import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from app.database.database import engine, Base
+from app.database.database import engine, async_engine, Base
 from app.routes import auth_routes
+from app.utils.password_pool import password_pool
+from app.utils.principal_cache import principal_cache
+from app.utils.email_dispatcher import email_dispatcher
+from app.utils.revocation_list import revocation_list
+from app.services.expiry_sweeper import (
+    verification_sweeper,
+    revocation_sweeper,
+    VERIFICATION_SWEEP_ENABLED,
+    REVOCATION_SWEEP_ENABLED
+)
+from app.services.token_revocation_service import load_revocations
+
+logger = logging.getLogger(__name__)
 
 # Create tables
 # Base.metadata.create_all(bind=engine)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    email_dispatcher.start()
+    try:
+        await load_revocations()
+    except Exception as e:
+        logger.error(f"Could not load token revocations: {str(e)}")
+    if VERIFICATION_SWEEP_ENABLED:
+        verification_sweeper.start()
+    if REVOCATION_SWEEP_ENABLED:
+        revocation_sweeper.start()
+    yield
+    await revocation_sweeper.stop()
+    await verification_sweeper.stop()
+    await email_dispatcher.stop()
+    await async_engine.dispose()
+    password_pool.shutdown()
+
+
 app = FastAPI(
     title="User Service with Auth",
     version="1.0.0",
-    description="User authentication service with JWT"
+    description="User authentication service with JWT",
+    lifespan=lifespan
 )
 
 app.include_router(auth_routes.router)
@@ -23,4 +58,28 @@ def health_check():
 
 @app.get("/health")
 def health():
-    return {"status": "healthy"}
\ No newline at end of file
+    return {"status": "healthy"}
+
+@app.get("/health/password-pool")
+def password_pool_stats():
+    return password_pool.stats()
+
+@app.get("/health/principal-cache")
+def principal_cache_stats():
+    return principal_cache.stats()
+
+@app.get("/health/email")
+def email_dispatcher_stats():
+    return email_dispatcher.stats()
+
+@app.get("/health/revocations")
+def revocation_list_stats():
+    return revocation_list.stats()
+
+@app.get("/health/verification-sweeper")
+def verification_sweeper_stats():
+    return verification_sweeper.stats()
+
+@app.get("/health/revocation-sweeper")
+def revocation_sweeper_stats():
+    return revocation_sweeper.stats()
\ No newline at end of file
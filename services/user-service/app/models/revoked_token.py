@@ -0,0 +1,14 @@
+# app/models/revoked_token.py
+from sqlalchemy import Column, String, DateTime
+from datetime import datetime
+from app.database.database import Base
+
+
+class RevokedToken(Base):
+    """Revoked refresh token (by jti) or token family (by "fam:<id>"), shared by every replica"""
+    __tablename__ = "revoked_tokens"
+
+    key = Column(String(64), primary_key=True)
+    # Kept until the token it revokes would have expired; indexed for the expiry sweeper
+    expires_at = Column(DateTime, nullable=False, index=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
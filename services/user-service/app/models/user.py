@@ -1,5 +1,5 @@
 # app/models/user.py
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Enum
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Enum, Index, func
 from datetime import datetime
 from app.database.database import Base
 import enum
@@ -21,11 +21,19 @@ class User(Base):
     # Role field with default 'customer'
     role = Column(String, default=UserRole.CUSTOMER.value, nullable=False)
     
-    # Email verification fields
+    # Email verification status; pending tokens live in email_verification_tokens
     is_verified = Column(Boolean, default=False, nullable=False)
-    verification_token = Column(String, nullable=True, unique=True)
-    verification_token_expires = Column(DateTime, nullable=True)
     
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
\ No newline at end of file
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    # Admin listing: keyset pagination on id within each filter
+    __table_args__ = (
+        Index("ix_users_role_id", "role", "id"),
+        Index("ix_users_is_verified_id", "is_verified", "id"),
+        Index("ix_users_created_at_id", "created_at", "id"),
+        # Case-insensitive uniqueness; registration relies on these instead of pre-checks
+        Index("uq_users_email_lower", func.lower(email), unique=True),
+        Index("uq_users_username_lower", func.lower(username), unique=True),
+    )
@@ -0,0 +1,16 @@
+# app/models/verification_token.py
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from datetime import datetime
+from app.database.database import Base
+
+
+class VerificationToken(Base):
+    """Pending email verification, keyed by the SHA-256 of the emailed token"""
+    __tablename__ = "email_verification_tokens"
+
+    # Hex SHA-256 of the token; the raw token is only ever in the email
+    token_hash = Column(String(64), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    # Indexed for the expiry sweeper
+    expires_at = Column(DateTime, nullable=False, index=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -1,15 +1,24 @@
 # app/routes/auth_routes.py
 from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks, Query
+from fastapi.responses import StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-from app.database.database import get_db
-from app.schemas.user_schema import UserCreate, UserLogin, UserResponse
-from app.schemas.token_schema import Token
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database.database import get_async_db
+from app.schemas.user_schema import UserCreate, UserLogin, UserResponse, UserRoleType
+from app.schemas.token_schema import Token, RefreshRequest, LogoutRequest
 from app.controllers.auth_controller import AuthController
+from app.services.auth_service import load_principal
+from app.services.token_revocation_service import is_revoked_persisted
+from app.services.user_admin_service import (
+    list_users, export_users_ndjson, export_users_csv, get_users_by_ids, USER_LOOKUP_MAX_IDS
+)
 from app.utils.jwt_handler import verify_token
 from app.utils.role_checker import require_admin, require_staff_or_admin
 from app.models.user import User
+from app.utils.principal_cache import principal_cache, Principal
 from pydantic import EmailStr
+from datetime import datetime
+from typing import List, Literal, Optional
 
 
 security = HTTPBearer()
@@ -17,25 +26,25 @@ router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 
 # ============= Dependency for Protected Routes =============
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
+def get_token_payload(
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+) -> dict:
     """
-    Dependency to get current authenticated user from JWT token
+    Dependency to verify the bearer access token
+    
+    Signature, expiry, token type and revocation are all checked in
+    memory; nothing here touches the database.
     
     Args:
         credentials: Bearer token from Authorization header
-        db: Database session
         
     Returns:
-        User: Authenticated user object
+        dict: Decoded token claims
         
     Raises:
-        HTTPException: If token is invalid or user not found
+        HTTPException: If token is invalid, revoked or not an access token
     """
-    token = credentials.credentials
-    payload = verify_token(token)
+    payload = verify_token(credentials.credentials)
     
     if payload is None:
         raise HTTPException(
@@ -44,23 +53,43 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    email: str = payload.get("sub")
-    if email is None:
+    if payload.get("sub") is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token payload",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    return payload
+
+
+async def get_current_user(
+    payload: dict = Depends(get_token_payload),
+    db: AsyncSession = Depends(get_async_db)
+) -> Principal:
+    """
+    Dependency to get current authenticated user from JWT token
     
-    user = db.query(User).filter(User.email == email).first()
-    if user is None:
+    Served from the principal cache when possible; only a miss touches
+    the database.
+    
+    Args:
+        payload: Verified access token claims
+        db: Database session
+        
+    Returns:
+        Principal: Snapshot of the authenticated user
+        
+    Raises:
+        HTTPException: If token is invalid or user not found
+    """
+    principal = await load_principal(db, payload["sub"])
+    if principal is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    
-    return user
+    return principal
 
 
 # ============= Public Routes =============
@@ -70,10 +99,10 @@ def get_current_user(
     summary="Register a new user",
     description="Create a new user account and send verification email"
 )
-def register(
+async def register(
     user: UserCreate,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     **User Registration Endpoint**
@@ -85,7 +114,7 @@ def register(
     
     Returns success message. User must verify email before logging in.
     """
-    return AuthController.register_new_user(user, db, background_tasks)
+    return await AuthController.register_new_user(user, db, background_tasks)
 
 
 @router.get(
@@ -93,10 +122,10 @@ def register(
     summary="Verify email address",
     description="Verify user email with token from verification link"
 )
-def verify_email(
+async def verify_email(
     token: str = Query(..., description="Verification token from email"),
     background_tasks: BackgroundTasks = BackgroundTasks(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     **Email Verification Endpoint**
@@ -105,7 +134,7 @@ def verify_email(
     
     Verifies the user's email and sends welcome email.
     """
-    return AuthController.verify_email(token, db, background_tasks)
+    return await AuthController.verify_email(token, db, background_tasks)
 
 
 @router.post(
@@ -113,10 +142,10 @@ def verify_email(
     summary="Resend verification email",
     description="Request a new verification email"
 )
-def resend_verification(
+async def resend_verification(
     email: EmailStr,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     **Resend Verification Email**
@@ -125,7 +154,7 @@ def resend_verification(
     
     Generates new token and sends verification email.
     """
-    return AuthController.resend_verification(email, db, background_tasks)
+    return await AuthController.resend_verification(email, db, background_tasks)
 
 
 @router.post(
@@ -134,18 +163,42 @@ def resend_verification(
     summary="User login",
     description="Authenticate user and return JWT access token"
 )
-def login(user: UserLogin, db: Session = Depends(get_db)):
+async def login(
+    user: UserLogin,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db)
+):
     """
     **User Login Endpoint**
     
     - **email**: Registered and verified email address
     - **password**: User password
     
-    Returns a JWT access token valid for 30 minutes.
+    Returns a short-lived JWT access token and a single-use refresh token.
     
     **Note**: Email must be verified before login.
     """
-    return AuthController.authenticate_user(user, db)
+    return await AuthController.authenticate_user(user, db, background_tasks)
+
+
+@router.post(
+    "/refresh",
+    response_model=Token,
+    summary="Refresh tokens",
+    description="Exchange a refresh token for a new access/refresh token pair"
+)
+async def refresh(
+    body: RefreshRequest,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    **Token Refresh Endpoint**
+    
+    - **refresh_token**: Refresh token from login or a previous refresh
+    
+    Each refresh token works once; the response carries its replacement.
+    """
+    return await AuthController.refresh_tokens(body.refresh_token, db)
 
 
 # ============= Protected Routes (Any Authenticated User) =============
@@ -155,7 +208,7 @@ def login(user: UserLogin, db: Session = Depends(get_db)):
     summary="Get current user profile",
     description="Retrieve authenticated user's profile information"
 )
-def get_current_user_info(current_user: User = Depends(get_current_user)):
+async def get_current_user_info(current_user: Principal = Depends(get_current_user)):
     """
     **Get Current User Profile**
     
@@ -166,41 +219,164 @@ def get_current_user_info(current_user: User = Depends(get_current_user)):
     return AuthController.get_user_profile(current_user)
 
 
+def _lookup_allowed(current_user: Principal, user_id: int) -> bool:
+    # Staff and admins may look up anyone; other users only themselves
+    return current_user.role in ("admin", "staff") or current_user.id == user_id
+
+
+@router.get(
+    "/users",
+    response_model=List[UserResponse],
+    summary="Look up users by id",
+    description="Batch lookup of users by id - Staff/Admin, or your own id"
+)
+async def get_users(
+    ids: List[int] = Query(..., description="User ids, repeated: ?ids=1&ids=2"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    **Batch User Lookup**
+    
+    Requires: Bearer token in Authorization header
+    
+    Returns every requested user that exists, in one query; unknown ids
+    are left out. Customers only get their own record back.
+    Used by the gateway's composite booking views.
+    """
+    if len(ids) > USER_LOOKUP_MAX_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {USER_LOOKUP_MAX_IDS} ids per request"
+        )
+    allowed = [user_id for user_id in ids if _lookup_allowed(current_user, user_id)]
+    return await get_users_by_ids(db, allowed)
+
+
+@router.get(
+    "/users/{user_id}",
+    response_model=UserResponse,
+    summary="Get user by id",
+    description="Retrieve one user by id - Staff/Admin, or your own id"
+)
+async def get_user(
+    user_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    **Get User by ID**
+    
+    Requires: Staff or Admin role, unless the id is your own
+    """
+    if not _lookup_allowed(current_user, user_id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Staff or Admin access required"
+        )
+    users = await get_users_by_ids(db, [user_id])
+    if not users:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+    return users[0]
+
+
+@router.get(
+    "/introspect",
+    summary="Check an access token",
+    description="Whether the bearer access token is still valid, including revocations from any replica"
+)
+async def introspect(
+    payload: dict = Depends(get_token_payload),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    **Token Introspection**
+    
+    Requires: Bearer token in Authorization header
+    
+    Used by the API gateway before it caches a token's claims. Unlike the
+    in-memory check on other routes, this also consults the shared
+    revocation table, so a logout on any replica is seen.
+    """
+    if await is_revoked_persisted(db, payload):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return {"active": True, "exp": payload["exp"]}
+
+
+@router.post(
+    "/logout",
+    summary="Logout",
+    description="Revoke the current access token and, optionally, its refresh token"
+)
+async def logout(
+    body: LogoutRequest = LogoutRequest(),
+    payload: dict = Depends(get_token_payload),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    **Logout Endpoint**
+    
+    Requires: Bearer token in Authorization header
+    
+    - **refresh_token** (optional): also revokes every token from the same login
+    """
+    return await AuthController.logout(payload, body.refresh_token, db)
+
+
 # ============= Admin Only Routes =============
 @router.get(
     "/admin/users",
-    summary="Get all users (Admin only)",
-    description="Retrieve list of all users - Admin access required"
+    summary="List users (Admin only)",
+    description="Keyset-paginated, filterable user listing - Admin access required"
 )
-def get_all_users(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+async def get_all_users(
+    limit: int = Query(50, ge=1, le=500, description="Users per page"),
+    cursor: Optional[int] = Query(None, description="next_cursor from the previous page"),
+    role: Optional[UserRoleType] = Query(None, description="Filter by role"),
+    is_verified: Optional[bool] = Query(None, description="Filter by verification status"),
+    created_from: Optional[datetime] = Query(None, description="Created at or after (ISO 8601)"),
+    created_to: Optional[datetime] = Query(None, description="Created before (ISO 8601)"),
+    format: Literal["json", "ndjson", "csv"] = Query("json", description="json page, or a full ndjson/csv export"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """
-    **Get All Users - Admin Only**
+    **List Users - Admin Only**
     
     Requires: Admin role
     
-    Returns list of all registered users
+    - **json** (default): one page of users plus `next_cursor`; pass it back as `cursor`
+    - **ndjson** / **csv**: streams every matching user, ignoring `limit` and `cursor`
     """
     # Check admin role
     require_admin(current_user)
     
-    users = db.query(User).all()
-    return {
-        "total_users": len(users),
-        "users": [
-            {
-                "id": user.id,
-                "username": user.username,
-                "email": user.email,
-                "role": user.role,
-                "is_verified": user.is_verified,
-                "created_at": user.created_at
-            }
-            for user in users
-        ]
-    }
+    filters = dict(
+        role=role,
+        is_verified=is_verified,
+        created_from=created_from,
+        created_to=created_to
+    )
+    if format == "ndjson":
+        return StreamingResponse(
+            export_users_ndjson(**filters),
+            media_type="application/x-ndjson",
+            headers={"Content-Disposition": 'attachment; filename="users.ndjson"'}
+        )
+    if format == "csv":
+        return StreamingResponse(
+            export_users_csv(**filters),
+            media_type="text/csv",
+            headers={"Content-Disposition": 'attachment; filename="users.csv"'}
+        )
+    return await list_users(db, limit, after_id=cursor, **filters)
 
 
 @router.delete(
@@ -208,10 +384,10 @@ def get_all_users(
     summary="Delete user (Admin only)",
     description="Delete a user by ID - Admin access required"
 )
-def delete_user(
+async def delete_user(
     user_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     **Delete User - Admin Only**
@@ -223,7 +399,7 @@ def delete_user(
     # Check admin role
     require_admin(current_user)
     
-    user_to_delete = db.query(User).filter(User.id == user_id).first()
+    user_to_delete = await db.get(User, user_id)
     
     if not user_to_delete:
         raise HTTPException(
@@ -238,8 +414,9 @@ def delete_user(
             detail="Cannot delete your own account"
         )
     
-    db.delete(user_to_delete)
-    db.commit()
+    await db.delete(user_to_delete)
+    await db.commit()
+    principal_cache.invalidate(user_to_delete.email)
     
     return {"message": f"User {user_to_delete.username} deleted successfully"}
 
@@ -250,8 +427,8 @@ def delete_user(
     summary="Staff dashboard (Staff/Admin only)",
     description="Access staff dashboard - Staff or Admin access required"
 )
-def staff_dashboard(
-    current_user: User = Depends(get_current_user)
+async def staff_dashboard(
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     **Staff Dashboard - Staff/Admin Only**
@@ -280,7 +457,7 @@ def staff_dashboard(
     summary="Protected route example",
     description="Example of a protected route that requires authentication"
 )
-def protected_route(current_user: User = Depends(get_current_user)):
+async def protected_route(current_user: Principal = Depends(get_current_user)):
     """
     **Protected Route Example**
     
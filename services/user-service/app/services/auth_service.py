@@ -1,66 +1,96 @@
 # app/services/auth_service.py
-from sqlalchemy.orm import Session
+from sqlalchemy import select, insert, delete, func
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 from datetime import datetime, timedelta
 from app.models.user import User
+from app.models.verification_token import VerificationToken
 from app.schemas.user_schema import UserCreate, UserLogin
-from app.utils.hash import hash_password, verify_password
-from app.utils.jwt_handler import create_access_token
-from app.utils.token_generator import generate_verification_token
+from app.utils.password_pool import password_pool, PasswordPoolBusy
+from app.utils.hash import needs_rehash
+from app.database.database import SessionLocal
+from app.utils.principal_cache import principal_cache, Principal
+from app.utils.jwt_handler import (
+    create_token_pair,
+    decode_token,
+    is_revoked,
+    revoke_token,
+    revoke_family,
+    REFRESH_TOKEN
+)
+from app.services.token_revocation_service import (
+    claim_refresh_token,
+    is_family_revoked,
+    persist_token_revocation,
+    persist_family_revocation
+)
+from app.utils.token_generator import generate_verification_token, hash_token
 from app.utils.email_service import send_verification_email, send_welcome_email
 from fastapi import BackgroundTasks
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Unique indexes on users: the case-insensitive ones, and the original column indexes
+EMAIL_UNIQUE_INDEXES = {"uq_users_email_lower", "ix_users_email"}
+USERNAME_UNIQUE_INDEXES = {"uq_users_username_lower", "ix_users_username"}
 
-def register_user(db: Session, user: UserCreate, background_tasks: BackgroundTasks) -> User:
+
+def email_equals(email: str):
+    """Case-insensitive email match, served by uq_users_email_lower"""
+    return func.lower(User.email) == email.lower()
+
+
+async def register_user(db: AsyncSession, user: UserCreate, background_tasks: BackgroundTasks):
     """
     Register a new user in the database and send verification email
     
+    A single INSERT ... RETURNING; duplicates are rejected by the unique
+    indexes on email/username (case-insensitive) rather than by pre-check
+    queries, which also closes the race between concurrent signups.
+    
     Args:
         db: Database session
         user: UserCreate schema with registration data
         background_tasks: FastAPI background tasks for async email sending
         
     Returns:
-        User: Created user object
+        Row: Created user's id, username, email and role
         
     Raises:
         ValueError: If user already exists or validation fails
     """
     try:
-        # Check if email already exists
-        existing_email = db.query(User).filter(User.email == user.email).first()
-        if existing_email:
-            logger.warning(f"Registration attempt with existing email: {user.email}")
-            raise ValueError("Email already registered")
-        
-        # Check if username already exists
-        existing_username = db.query(User).filter(User.username == user.username).first()
-        if existing_username:
-            logger.warning(f"Registration attempt with existing username: {user.username}")
-            raise ValueError("Username already taken")
-        
         # Generate verification token
         verification_token = generate_verification_token()
         verification_expires = datetime.utcnow() + timedelta(hours=24)
+        now = datetime.utcnow()
         
         # Create new user with hashed password and role
-        hashed_pwd = hash_password(user.password)
-        db_user = User(
-            username=user.username,
-            email=user.email,
-            hashed_password=hashed_pwd,
-            role=user.role,  # FIX: Save the role from user input
-            is_verified=False,
-            verification_token=verification_token,
-            verification_token_expires=verification_expires
+        hashed_pwd = await password_pool.hash_password_async(user.password)
+        result = await db.execute(
+            insert(User)
+            .values(
+                username=user.username,
+                email=user.email,
+                hashed_password=hashed_pwd,
+                role=user.role,  # FIX: Save the role from user input
+                is_verified=False,
+                created_at=now,
+                updated_at=now
+            )
+            .returning(User.id, User.username, User.email, User.role)
         )
-        
-        db.add(db_user)
-        db.commit()
-        db.refresh(db_user)
+        db_user = result.one()
+        await db.execute(
+            insert(VerificationToken).values(
+                token_hash=hash_token(verification_token),
+                user_id=db_user.id,
+                expires_at=verification_expires,
+                created_at=now
+            )
+        )
+        await db.commit()
         
         # Send verification email in background
         background_tasks.add_task(
@@ -74,18 +104,35 @@ def register_user(db: Session, user: UserCreate, background_tasks: BackgroundTas
         return db_user
         
     except IntegrityError as e:
-        db.rollback()
+        await db.rollback()
+        constraint = _violated_constraint(e)
+        if constraint in EMAIL_UNIQUE_INDEXES:
+            logger.warning(f"Registration attempt with existing email: {user.email}")
+            raise ValueError("Email already registered")
+        if constraint in USERNAME_UNIQUE_INDEXES:
+            logger.warning(f"Registration attempt with existing username: {user.username}")
+            raise ValueError("Username already taken")
         logger.error(f"Database integrity error during registration: {str(e)}")
         raise ValueError("User registration failed due to database constraint")
-    except ValueError:
+    except (ValueError, PasswordPoolBusy):
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Unexpected error during registration: {str(e)}")
         raise ValueError("An unexpected error occurred during registration")
 
 
-def verify_user_email(db: Session, token: str, background_tasks: BackgroundTasks) -> dict:
+def _violated_constraint(error: IntegrityError) -> str | None:
+    """Name of the constraint/index behind an IntegrityError, if the driver reports it"""
+    orig = error.orig
+    # asyncpg wraps the driver error; psycopg2 exposes diagnostics directly
+    name = getattr(getattr(orig, "__cause__", None), "constraint_name", None)
+    if name is None:
+        name = getattr(getattr(orig, "diag", None), "constraint_name", None)
+    return name
+
+
+async def verify_user_email(db: AsyncSession, token: str, background_tasks: BackgroundTasks) -> dict:
     """
     Verify user email with token
     
@@ -101,30 +148,35 @@ def verify_user_email(db: Session, token: str, background_tasks: BackgroundTasks
         ValueError: If token is invalid or expired
     """
     try:
-        # Find user by verification token
-        user = db.query(User).filter(User.verification_token == token).first()
-        
-        if not user:
-            logger.warning(f"Verification attempt with invalid token: {token}")
+        # Single primary-key lookup on the token hash, joined to its user
+        row = (await db.execute(
+            select(VerificationToken.expires_at, User)
+            .join(User, User.id == VerificationToken.user_id)
+            .where(VerificationToken.token_hash == hash_token(token))
+        )).first()
+        
+        if not row:
+            logger.warning("Verification attempt with invalid token")
             raise ValueError("Invalid verification token")
         
+        expires_at, user = row
+        
         if user.is_verified:
             logger.info(f"User already verified: {user.email}")
             raise ValueError("Email already verified")
         
         # Check if token is expired
-        if user.verification_token_expires < datetime.utcnow():
+        if expires_at < datetime.utcnow():
             logger.warning(f"Expired verification token for user: {user.email}")
             raise ValueError("Verification token has expired. Please request a new one.")
         
-        # Update user verification status
+        # Update user verification status and drop all of the user's pending tokens
         user.is_verified = True
-        user.verification_token = None
-        user.verification_token_expires = None
         user.updated_at = datetime.utcnow()
+        await db.execute(delete(VerificationToken).where(VerificationToken.user_id == user.id))
         
-        db.commit()
-        db.refresh(user)
+        await db.commit()
+        principal_cache.invalidate(user.email)
         
         # Send welcome email in background
         background_tasks.add_task(
@@ -147,12 +199,12 @@ def verify_user_email(db: Session, token: str, background_tasks: BackgroundTasks
     except ValueError:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Error during email verification: {str(e)}")
         raise ValueError("An error occurred during email verification")
 
 
-def resend_verification_email(db: Session, email: str, background_tasks: BackgroundTasks) -> dict:
+async def resend_verification_email(db: AsyncSession, email: str, background_tasks: BackgroundTasks) -> dict:
     """
     Resend verification email to user
     
@@ -168,7 +220,7 @@ def resend_verification_email(db: Session, email: str, background_tasks: Backgro
         ValueError: If user not found or already verified
     """
     try:
-        user = db.query(User).filter(User.email == email).first()
+        user = await db.scalar(select(User).where(email_equals(email)))
         
         if not user:
             logger.warning(f"Resend verification attempt for non-existent email: {email}")
@@ -181,11 +233,15 @@ def resend_verification_email(db: Session, email: str, background_tasks: Backgro
         verification_token = generate_verification_token()
         verification_expires = datetime.utcnow() + timedelta(hours=24)
         
-        user.verification_token = verification_token
-        user.verification_token_expires = verification_expires
-        user.updated_at = datetime.utcnow()
+        # A new token replaces any earlier one
+        await db.execute(delete(VerificationToken).where(VerificationToken.user_id == user.id))
+        db.add(VerificationToken(
+            token_hash=hash_token(verification_token),
+            user_id=user.id,
+            expires_at=verification_expires
+        ))
         
-        db.commit()
+        await db.commit()
         
         # Send verification email in background
         background_tasks.add_task(
@@ -201,28 +257,29 @@ def resend_verification_email(db: Session, email: str, background_tasks: Backgro
     except ValueError:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Error resending verification email: {str(e)}")
         raise ValueError("An error occurred while resending verification email")
 
 
-def login_user(db: Session, user: UserLogin) -> str | None:
+async def login_user(db: AsyncSession, user: UserLogin, background_tasks: BackgroundTasks | None = None) -> dict | None:
     """
-    Authenticate user and generate JWT token
+    Authenticate user and generate access and refresh tokens
     
     Args:
         db: Database session
         user: UserLogin schema with credentials
+        background_tasks: Used to upgrade hashes made under an older policy
         
     Returns:
-        str: JWT access token if authentication successful, None otherwise
+        dict: access_token, refresh_token and expires_in if authentication successful, None otherwise
         
     Raises:
         ValueError: If email not verified
     """
     try:
         # Find user by email
-        db_user = db.query(User).filter(User.email == user.email).first()
+        db_user = await db.scalar(select(User).where(email_equals(user.email)))
         
         if not db_user:
             logger.warning(f"Login attempt with non-existent email: {user.email}")
@@ -234,10 +291,19 @@ def login_user(db: Session, user: UserLogin) -> str | None:
             raise ValueError("Please verify your email before logging in")
         
         # Verify password
-        if not verify_password(user.password, db_user.hashed_password):
+        if not await password_pool.verify_password_async(user.password, db_user.hashed_password):
             logger.warning(f"Failed login attempt for user: {user.email}")
             return None
         
+        # Upgrade hashes made with an older scheme or cost, off the request path
+        if background_tasks is not None and needs_rehash(db_user.hashed_password):
+            background_tasks.add_task(
+                upgrade_password_hash,
+                db_user.id,
+                db_user.hashed_password,
+                user.password
+            )
+        
         # Generate JWT token with user email, role, and other info
         token_data = {
             "sub": db_user.email,
@@ -245,19 +311,129 @@ def login_user(db: Session, user: UserLogin) -> str | None:
             "username": db_user.username,
             "role": db_user.role  # Include role in token
         }
-        token = create_access_token(token_data)
+        tokens = create_token_pair(token_data)
         
         logger.info(f"User logged in successfully: {db_user.email} (role: {db_user.role})")
-        return token
+        return tokens
         
-    except ValueError:
+    except (ValueError, PasswordPoolBusy):
         raise
     except Exception as e:
         logger.error(f"Error during login: {str(e)}")
         return None
 
 
-def get_user_by_email(db: Session, email: str) -> User | None:
+async def refresh_user_tokens(db: AsyncSession, refresh_token: str) -> dict:
+    """
+    Rotate a refresh token into a new access/refresh pair
+    
+    The presented refresh token is recorded as used in the shared
+    revoked_tokens table, so each one works once across every replica and
+    restart. If an already rotated token comes back it has probably
+    leaked, and its whole token family is revoked.
+    
+    Args:
+        db: Database session
+        refresh_token: Refresh token from a previous login or refresh
+        
+    Returns:
+        dict: New access_token, refresh_token and expires_in
+        
+    Raises:
+        ValueError: If the refresh token is invalid, revoked or the user is gone
+    """
+    payload = decode_token(refresh_token)
+    if payload is None or payload.get("type") != REFRESH_TOKEN or not payload.get("jti"):
+        raise ValueError("Invalid refresh token")
+    
+    # In-memory check first: a reuse seen by this process needs no query
+    reused = is_revoked(payload)
+    # Revoke before any await so a concurrent refresh in this process fails fast
+    revoke_token(payload)
+    if not reused:
+        reused = await is_family_revoked(db, payload) or not await claim_refresh_token(db, payload)
+    
+    if reused:
+        revoke_family(payload)
+        await persist_family_revocation(db, payload)
+        await db.commit()
+        logger.warning(f"Reuse of revoked refresh token for {payload.get('sub')}, token family revoked")
+        raise ValueError("Refresh token has been revoked")
+    await db.commit()
+    
+    principal = await load_principal(db, payload.get("sub"))
+    if principal is None:
+        raise ValueError("User not found")
+    
+    token_data = {
+        "sub": principal.email,
+        "user_id": principal.id,
+        "username": principal.username,
+        "role": principal.role
+    }
+    return create_token_pair(token_data, family=payload.get("fam"))
+
+
+async def logout_user(db: AsyncSession, access_payload: dict, refresh_token: str | None = None):
+    """
+    Revoke the caller's tokens
+    
+    Args:
+        db: Database session
+        access_payload: Decoded access token of the current request
+        refresh_token: Refresh token to revoke along with it; when given,
+            every token from the same login is revoked, on every replica
+    """
+    revoke_token(access_payload)
+    # Shared so the gateway's revocation check sees it from any replica
+    await persist_token_revocation(db, access_payload)
+    if refresh_token:
+        payload = decode_token(refresh_token)
+        if payload is not None and payload.get("sub") == access_payload.get("sub"):
+            revoke_token(payload)
+            revoke_family(payload)
+            await persist_family_revocation(db, payload)
+    await db.commit()
+    logger.info(f"User logged out: {access_payload.get('sub')}")
+
+
+def upgrade_password_hash(user_id: int, old_hash: str, password: str) -> bool:
+    """
+    Re-hash a password under the current hashing policy
+    
+    Runs as a background task after a successful login, with its own
+    session. The update only applies if the stored hash is unchanged, so
+    a concurrent password change is never overwritten.
+    
+    Args:
+        user_id: User ID
+        old_hash: Hash the password was verified against
+        password: Plain password from the login request
+        
+    Returns:
+        bool: True if the stored hash was upgraded
+    """
+    db = SessionLocal()
+    try:
+        new_hash = password_pool.hash_password(password)
+        updated = (
+            db.query(User)
+            .filter(User.id == user_id, User.hashed_password == old_hash)
+            .update({User.hashed_password: new_hash}, synchronize_session=False)
+        )
+        db.commit()
+        if updated:
+            logger.info(f"Upgraded password hash for user id {user_id}")
+        return bool(updated)
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error upgrading password hash for user id {user_id}: {str(e)}")
+        return False
+    finally:
+        db.close()
+
+
+async def get_user_by_email(db: AsyncSession, email: str) -> User | None:
     """
     Retrieve user by email address
     
@@ -269,13 +445,13 @@ def get_user_by_email(db: Session, email: str) -> User | None:
         User object if found, None otherwise
     """
     try:
-        return db.query(User).filter(User.email == email).first()
+        return await db.scalar(select(User).where(email_equals(email)))
     except Exception as e:
         logger.error(f"Error fetching user by email: {str(e)}")
         return None
 
 
-def get_user_by_id(db: Session, user_id: int) -> User | None:
+async def get_user_by_id(db: AsyncSession, user_id: int) -> User | None:
     """
     Retrieve user by ID
     
@@ -287,7 +463,35 @@ def get_user_by_id(db: Session, user_id: int) -> User | None:
         User object if found, None otherwise
     """
     try:
-        return db.query(User).filter(User.id == user_id).first()
+        return await db.get(User, user_id)
     except Exception as e:
         logger.error(f"Error fetching user by ID: {str(e)}")
-        return None
\ No newline at end of file
+        return None
+
+
+async def load_principal(db: AsyncSession, email: str) -> Principal | None:
+    """
+    Retrieve the principal for a token subject, from cache when possible
+    
+    Args:
+        db: Database session
+        email: Token subject (user email)
+        
+    Returns:
+        Principal if the user exists, None otherwise
+    """
+    principal = principal_cache.get(email)
+    if principal is not None:
+        return principal
+    
+    result = await db.execute(
+        select(User.id, User.username, User.email, User.role, User.is_verified)
+        .where(email_equals(email))
+    )
+    user = result.first()
+    if user is None:
+        return None
+    
+    principal = Principal.from_user(user)
+    principal_cache.set(email, principal)
+    return principal
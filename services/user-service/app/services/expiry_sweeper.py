@@ -0,0 +1,122 @@
+# app/services/expiry_sweeper.py
+import os
+import asyncio
+import logging
+from datetime import datetime
+from sqlalchemy import select, delete
+from dotenv import load_dotenv
+from app.database.database import AsyncSessionLocal
+from app.models.verification_token import VerificationToken
+from app.models.revoked_token import RevokedToken
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Each sweeper: on/off, run interval, rows deleted per transaction and the pause between chunks
+VERIFICATION_SWEEP_ENABLED = os.getenv("VERIFICATION_SWEEP_ENABLED", "true").lower() == "true"
+VERIFICATION_SWEEP_INTERVAL = float(os.getenv("VERIFICATION_SWEEP_INTERVAL", 3600))
+VERIFICATION_SWEEP_BATCH = int(os.getenv("VERIFICATION_SWEEP_BATCH", 1000))
+VERIFICATION_SWEEP_PAUSE = float(os.getenv("VERIFICATION_SWEEP_PAUSE", 0.1))
+
+# Also bounds the revocation list each replica loads at startup, so keep it on
+REVOCATION_SWEEP_ENABLED = os.getenv("REVOCATION_SWEEP_ENABLED", "true").lower() == "true"
+REVOCATION_SWEEP_INTERVAL = float(os.getenv("REVOCATION_SWEEP_INTERVAL", 3600))
+REVOCATION_SWEEP_BATCH = int(os.getenv("REVOCATION_SWEEP_BATCH", 1000))
+REVOCATION_SWEEP_PAUSE = float(os.getenv("REVOCATION_SWEEP_PAUSE", 0.1))
+
+
+class ExpirySweeper:
+    """
+    Periodically deletes expired rows of one table in small chunks
+
+    Each chunk is its own short transaction over at most `batch_size`
+    rows picked through the expires_at index with SKIP LOCKED, so the
+    sweep never holds long locks and replicas sweeping at the same time
+    do not block each other.
+    """
+
+    def __init__(self, model, key_column, interval: float, batch_size: int, pause: float):
+        self.model = model
+        self.key_column = key_column
+        self.interval = interval
+        self.batch_size = batch_size
+        self.pause = pause
+        self._task: asyncio.Task | None = None
+        self.runs = 0
+        self.deleted = 0
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _loop(self):
+        while True:
+            try:
+                await self.sweep()
+            except Exception as e:
+                logger.error(f"Sweep of {self.model.__tablename__} failed: {str(e)}")
+            await asyncio.sleep(self.interval)
+
+    async def sweep(self) -> int:
+        """Delete every row expired as of now; returns the number of rows removed"""
+        cutoff = datetime.utcnow()
+        expired = (
+            select(self.key_column)
+            .where(self.model.expires_at < cutoff)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        total = 0
+        while True:
+            async with AsyncSessionLocal() as db:
+                result = await db.execute(
+                    delete(self.model).where(self.key_column.in_(expired))
+                )
+                await db.commit()
+            total += result.rowcount
+            if result.rowcount < self.batch_size:
+                break
+            await asyncio.sleep(self.pause)
+        self.runs += 1
+        self.deleted += total
+        if total:
+            logger.info(f"Swept {total} expired row(s) from {self.model.__tablename__}")
+        return total
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self._task is not None,
+            "interval_seconds": self.interval,
+            "batch_size": self.batch_size,
+            "runs": self.runs,
+            "deleted_total": self.deleted,
+        }
+
+
+verification_sweeper = ExpirySweeper(
+    VerificationToken,
+    VerificationToken.token_hash,
+    VERIFICATION_SWEEP_INTERVAL,
+    VERIFICATION_SWEEP_BATCH,
+    VERIFICATION_SWEEP_PAUSE
+)
+
+revocation_sweeper = ExpirySweeper(
+    RevokedToken,
+    RevokedToken.key,
+    REVOCATION_SWEEP_INTERVAL,
+    REVOCATION_SWEEP_BATCH,
+    REVOCATION_SWEEP_PAUSE
+)
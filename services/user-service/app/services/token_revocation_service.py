@@ -0,0 +1,106 @@
+# app/services/token_revocation_service.py
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime, timedelta
+from app.database.database import AsyncSessionLocal
+from app.models.revoked_token import RevokedToken
+from app.utils.jwt_handler import REFRESH_TOKEN_EXPIRE_DAYS
+from app.utils.revocation_list import revocation_list
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _family_key(payload: dict) -> str | None:
+    return f"fam:{payload['fam']}" if payload.get("fam") else None
+
+
+def _family_expiry() -> datetime:
+    # Outlives any refresh token the family can still hold
+    return datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+
+
+async def claim_refresh_token(db: AsyncSession, payload: dict) -> bool:
+    """
+    Record a refresh token's jti as used; False if it already was
+
+    The primary key makes this the single point of truth across replicas
+    and restarts: of two concurrent refreshes with the same token, exactly
+    one insert lands.
+    """
+    result = await db.execute(
+        insert(RevokedToken)
+        .values(key=payload["jti"], expires_at=datetime.utcfromtimestamp(payload["exp"]))
+        .on_conflict_do_nothing()
+        .returning(RevokedToken.key)
+    )
+    return result.first() is not None
+
+
+async def is_family_revoked(db: AsyncSession, payload: dict) -> bool:
+    family = _family_key(payload)
+    if family is None:
+        return False
+    found = await db.scalar(
+        select(RevokedToken.key)
+        .where(RevokedToken.key == family, RevokedToken.expires_at > datetime.utcnow())
+    )
+    return found is not None
+
+
+async def persist_token_revocation(db: AsyncSession, payload: dict):
+    """Revoke one token for every replica until its own expiry; the caller commits"""
+    if not payload.get("jti"):
+        return
+    await db.execute(
+        insert(RevokedToken)
+        .values(key=payload["jti"], expires_at=datetime.utcfromtimestamp(payload["exp"]))
+        .on_conflict_do_nothing()
+    )
+
+
+async def is_revoked_persisted(db: AsyncSession, payload: dict) -> bool:
+    """Whether the token or its family is revoked in the shared table; one primary-key lookup"""
+    keys = [key for key in (payload.get("jti"), _family_key(payload)) if key]
+    if not keys:
+        return False
+    found = await db.scalar(
+        select(RevokedToken.key)
+        .where(RevokedToken.key.in_(keys), RevokedToken.expires_at > datetime.utcnow())
+        .limit(1)
+    )
+    return found is not None
+
+
+async def persist_family_revocation(db: AsyncSession, payload: dict):
+    """Revoke the token's family for every replica; the caller commits"""
+    family = _family_key(payload)
+    if family is None:
+        return
+    await db.execute(
+        insert(RevokedToken)
+        .values(key=family, expires_at=_family_expiry())
+        .on_conflict_do_nothing()
+    )
+
+
+async def load_revocations() -> int:
+    """
+    Seed the in-memory revocation list from the shared table
+
+    Run at startup, so a restarted replica keeps rejecting access tokens
+    of families revoked before it came up.
+    """
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(
+            select(RevokedToken.key, RevokedToken.expires_at)
+            .where(RevokedToken.expires_at > datetime.utcnow())
+            .execution_options(yield_per=1000)
+        )
+        loaded = 0
+        async for key, expires_at in result:
+            revocation_list.revoke(key, (expires_at - datetime(1970, 1, 1)).total_seconds())
+            loaded += 1
+    logger.info(f"Loaded {loaded} token revocation(s)")
+    return loaded
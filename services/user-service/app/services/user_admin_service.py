@@ -0,0 +1,159 @@
+# app/services/user_admin_service.py
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
+from app.models.user import User
+from app.database.database import AsyncSessionLocal
+import csv
+import io
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Columns exposed by the admin listing; never the password hash or tokens
+USER_LIST_COLUMNS = (User.id, User.username, User.email, User.role, User.is_verified, User.created_at)
+USER_LIST_FIELDS = tuple(column.key for column in USER_LIST_COLUMNS)
+
+# Rows fetched per round trip while streaming an export
+EXPORT_BATCH_SIZE = 1000
+
+# Most ids accepted by one batch lookup
+USER_LOOKUP_MAX_IDS = 200
+USER_LOOKUP_COLUMNS = (User.id, User.username, User.email, User.role)
+
+
+def _filtered_query(
+    role: str | None = None,
+    is_verified: bool | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    after_id: int | None = None
+):
+    """Column-only SELECT over users, ordered by id for keyset pagination"""
+    query = select(*USER_LIST_COLUMNS)
+    if role is not None:
+        query = query.where(User.role == role)
+    if is_verified is not None:
+        query = query.where(User.is_verified == is_verified)
+    if created_from is not None:
+        query = query.where(User.created_at >= created_from)
+    if created_to is not None:
+        query = query.where(User.created_at < created_to)
+    if after_id is not None:
+        query = query.where(User.id > after_id)
+    return query.order_by(User.id)
+
+
+async def list_users(
+    db: AsyncSession,
+    limit: int,
+    after_id: int | None = None,
+    role: str | None = None,
+    is_verified: bool | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None
+) -> dict:
+    """
+    Return one keyset page of users
+
+    Args:
+        db: Database session
+        limit: Maximum number of users in the page
+        after_id: Cursor from the previous page (last user id seen)
+        role: Only users with this role
+        is_verified: Only verified / unverified users
+        created_from: Only users created at or after this time
+        created_to: Only users created before this time
+
+    Returns:
+        dict: Page of users and the cursor for the next page (None on the last page)
+    """
+    query = _filtered_query(role, is_verified, created_from, created_to, after_id)
+    # One extra row tells whether another page exists without a COUNT(*)
+    rows = (await db.execute(query.limit(limit + 1))).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    return {
+        "count": len(rows),
+        "next_cursor": rows[-1].id if has_more else None,
+        "users": [row._asdict() for row in rows]
+    }
+
+
+async def get_users_by_ids(db: AsyncSession, ids: list[int]) -> list[dict]:
+    """
+    Look up many users in one primary-key IN query
+
+    Args:
+        db: Database session
+        ids: User ids; duplicates and unknown ids are ignored
+
+    Returns:
+        list: id, username, email and role of each user found, ordered by id
+    """
+    if not ids:
+        return []
+    rows = (await db.execute(
+        select(*USER_LOOKUP_COLUMNS).where(User.id.in_(set(ids))).order_by(User.id)
+    )).all()
+    return [row._asdict() for row in rows]
+
+
+async def export_users_ndjson(**filters):
+    """
+    Stream all matching users as newline-delimited JSON
+
+    Uses its own session and a server-side cursor, so memory stays flat
+    regardless of how many users match.
+    """
+    lines = []
+    async for row in _stream_rows(**filters):
+        lines.append(json.dumps(row._asdict(), default=_json_default) + "\n")
+        if len(lines) >= EXPORT_BATCH_SIZE:
+            yield "".join(lines)
+            lines = []
+    if lines:
+        yield "".join(lines)
+
+
+async def export_users_csv(**filters):
+    """Stream all matching users as CSV with a header row"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(USER_LIST_FIELDS)
+    batch = 0
+    async for row in _stream_rows(**filters):
+        writer.writerow(_json_default(value) if isinstance(value, datetime) else value for value in row)
+        batch += 1
+        if batch >= EXPORT_BATCH_SIZE:
+            yield _drain(buffer)
+            batch = 0
+    yield _drain(buffer)
+
+
+async def _stream_rows(**filters):
+    async with AsyncSessionLocal() as db:
+        query = _filtered_query(**filters).execution_options(yield_per=EXPORT_BATCH_SIZE)
+        result = await db.stream(query)
+        try:
+            async for row in result:
+                yield row
+        except Exception as e:
+            logger.error(f"Error streaming user export: {str(e)}")
+            raise
+        finally:
+            await result.close()
+
+
+def _drain(buffer: io.StringIO) -> str:
+    data = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    return data
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
@@ -0,0 +1,220 @@
+# app/utils/email_dispatcher.py
+import os
+import asyncio
+import smtplib
+import time
+import logging
+from email.message import Message
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+SMTP_HOST = os.getenv("SMTP_HOST", "smtp.gmail.com")
+SMTP_PORT = int(os.getenv("SMTP_PORT", "587"))
+SMTP_USER = os.getenv("SMTP_USER")
+SMTP_PASSWORD = os.getenv("SMTP_PASSWORD")
+# Disable for plain local servers such as aiosmtpd
+SMTP_STARTTLS = os.getenv("SMTP_STARTTLS", "true").lower() == "true"
+SMTP_TIMEOUT = float(os.getenv("SMTP_TIMEOUT", 10))
+
+# Persistent SMTP connections, one per sender task
+EMAIL_CONNECTIONS = int(os.getenv("EMAIL_CONNECTIONS", 2))
+# Messages waiting to be sent before new ones are rejected
+EMAIL_QUEUE_MAX = int(os.getenv("EMAIL_QUEUE_MAX", 10000))
+# Messages sent per connection checkout, and how long to wait to fill a batch
+EMAIL_BATCH_SIZE = int(os.getenv("EMAIL_BATCH_SIZE", 50))
+EMAIL_BATCH_WAIT = float(os.getenv("EMAIL_BATCH_WAIT", 0.05))
+EMAIL_MAX_RETRIES = int(os.getenv("EMAIL_MAX_RETRIES", 3))
+EMAIL_RETRY_BACKOFF = float(os.getenv("EMAIL_RETRY_BACKOFF", 1.0))
+# Connections idle for longer than this are closed and reopened on demand
+EMAIL_IDLE_TIMEOUT = float(os.getenv("EMAIL_IDLE_TIMEOUT", 60))
+EMAIL_SHUTDOWN_TIMEOUT = float(os.getenv("EMAIL_SHUTDOWN_TIMEOUT", 10))
+
+
+class EmailQueueFull(Exception):
+    """Raised when the outgoing email queue is full"""
+
+
+class _SMTPConnection:
+    """One persistent SMTP session, reopened after errors or idleness"""
+
+    def __init__(self):
+        self._server: smtplib.SMTP | None = None
+        self._last_used = 0.0
+        self.connects = 0
+
+    def _open(self):
+        server = smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=SMTP_TIMEOUT)
+        try:
+            if SMTP_STARTTLS:
+                server.starttls()
+            if SMTP_USER:
+                server.login(SMTP_USER, SMTP_PASSWORD)
+        except Exception:
+            server.close()
+            raise
+        self._server = server
+        self.connects += 1
+
+    def send(self, from_email: str, to_email: str, message: Message):
+        if self._server is not None and time.monotonic() - self._last_used > EMAIL_IDLE_TIMEOUT:
+            self.close()
+        if self._server is None:
+            self._open()
+        try:
+            self._server.sendmail(from_email, [to_email], message.as_string())
+        except (smtplib.SMTPServerDisconnected, OSError):
+            # Drop the session so the retry reconnects
+            self.close()
+            raise
+        self._last_used = time.monotonic()
+
+    def close(self):
+        if self._server is None:
+            return
+        try:
+            self._server.quit()
+        except Exception:
+            self._server.close()
+        self._server = None
+
+
+def _is_permanent(error: Exception) -> bool:
+    """5xx replies will not succeed on retry"""
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(code >= 500 for code, _ in error.recipients.values())
+    if isinstance(error, smtplib.SMTPResponseException):
+        return error.smtp_code >= 500
+    return False
+
+
+class EmailDispatcher:
+    """
+    Queues outgoing emails and sends them over pooled SMTP connections
+
+    Each sender task owns one persistent connection, so STARTTLS and login
+    happen once per connection instead of once per message. Senders take
+    up to EMAIL_BATCH_SIZE messages at a time and deliver them back to
+    back on a worker thread. Transient failures are retried with
+    exponential backoff; the queue is bounded so a surge cannot exhaust
+    memory.
+    """
+
+    def __init__(self, connections: int, max_queue: int, batch_size: int, batch_wait: float):
+        self.connections = max(connections, 1)
+        self.max_queue = max_queue
+        self.batch_size = max(batch_size, 1)
+        self.batch_wait = batch_wait
+        self._queue: asyncio.Queue | None = None
+        self._senders: list[asyncio.Task] = []
+        self._pool: list[_SMTPConnection] = []
+        self.sent = 0
+        self.failed = 0
+        self.retried = 0
+        self.rejected = 0
+        self.batches = 0
+
+    def start(self):
+        if self._senders:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._pool = [_SMTPConnection() for _ in range(self.connections)]
+        self._senders = [asyncio.create_task(self._sender(conn)) for conn in self._pool]
+        logger.info(f"Email dispatcher started with {self.connections} SMTP connection(s)")
+
+    async def stop(self, timeout: float = EMAIL_SHUTDOWN_TIMEOUT):
+        if not self._senders:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Email dispatcher stopped with {self._queue.qsize()} message(s) unsent")
+        for task in self._senders:
+            task.cancel()
+        await asyncio.gather(*self._senders, return_exceptions=True)
+        self._senders = []
+        for conn in self._pool:
+            await asyncio.to_thread(conn.close)
+        self._pool = []
+
+    def submit(self, from_email: str, to_email: str, message: Message):
+        """
+        Queue a message for delivery
+
+        Raises:
+            EmailQueueFull: If EMAIL_QUEUE_MAX messages are already waiting
+        """
+        self.start()
+        try:
+            self._queue.put_nowait((from_email, to_email, message))
+        except asyncio.QueueFull:
+            self.rejected += 1
+            raise EmailQueueFull("Email queue is full")
+
+    async def _sender(self, conn: _SMTPConnection):
+        while True:
+            batch = [await self._queue.get()]
+            deadline = time.monotonic() + self.batch_wait
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                self.batches += 1
+                await self._send_batch(conn, batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _send_batch(self, conn: _SMTPConnection, batch: list):
+        pending = batch
+        for attempt in range(EMAIL_MAX_RETRIES + 1):
+            pending = await asyncio.to_thread(self._deliver, conn, pending)
+            if not pending:
+                return
+            if attempt < EMAIL_MAX_RETRIES:
+                self.retried += len(pending)
+                await asyncio.sleep(EMAIL_RETRY_BACKOFF * (2 ** attempt))
+        for _, to_email, _ in pending:
+            self.failed += 1
+            logger.error(f"Giving up on email to {to_email} after {EMAIL_MAX_RETRIES} retries")
+
+    def _deliver(self, conn: _SMTPConnection, batch: list) -> list:
+        """Send a batch on one connection; returns the messages worth retrying"""
+        retry = []
+        for item in batch:
+            from_email, to_email, message = item
+            try:
+                conn.send(from_email, to_email, message)
+                self.sent += 1
+                logger.info(f"Email \"{message['Subject']}\" sent to {to_email}")
+            except Exception as e:
+                if _is_permanent(e):
+                    self.failed += 1
+                    logger.error(f"Email to {to_email} rejected: {str(e)}")
+                else:
+                    logger.warning(f"Email to {to_email} failed, will retry: {str(e)}")
+                    retry.append(item)
+        return retry
+
+    def stats(self) -> dict:
+        return {
+            "connections": self.connections,
+            "connects_total": sum(conn.connects for conn in self._pool),
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "max_queue": self.max_queue,
+            "sent": self.sent,
+            "failed": self.failed,
+            "retried": self.retried,
+            "rejected": self.rejected,
+            "batches": self.batches,
+        }
+
+
+email_dispatcher = EmailDispatcher(EMAIL_CONNECTIONS, EMAIL_QUEUE_MAX, EMAIL_BATCH_SIZE, EMAIL_BATCH_WAIT)
@@ -0,0 +1,105 @@
+# app/utils/email_templates.py
+import html
+import re
+from email.mime.text import MIMEText
+from email.mime.multipart import MIMEMultipart
+from pathlib import Path
+from string import Template
+
+TEMPLATE_DIR = Path(__file__).resolve().parent.parent / "templates" / "email"
+
+# Subject and HTML header per email; bodies live in TEMPLATE_DIR/<name>.{txt,html}
+EMAILS = {
+    "verification": {
+        "subject": "Verify Your Smart Hotel Account",
+        "heading": "Welcome to Smart Hotel!",
+    },
+    "welcome": {
+        "subject": "Welcome to Smart Hotel!",
+        "heading": "✅ Email Verified!",
+    },
+}
+
+_FIELD = re.compile(r"\$\{([_a-z][_a-z0-9]*)\}", re.IGNORECASE)
+
+
+class CompiledTemplate:
+    """
+    Template pre-split into literal chunks and field names
+
+    Rendering is a single join over the chunks, with no parsing or regex
+    work per message.
+    """
+
+    def __init__(self, source: str):
+        self._parts = []
+        self.fields = set()
+        position = 0
+        for match in _FIELD.finditer(source):
+            self._parts.append(source[position:match.start()])
+            self._parts.append(match.group(1))
+            self.fields.add(match.group(1))
+            position = match.end()
+        self._parts.append(source[position:])
+
+    def render(self, values: dict) -> str:
+        parts = self._parts
+        # Literals sit at even indexes, field names at odd ones
+        return "".join(
+            part if i % 2 == 0 else values[part]
+            for i, part in enumerate(parts)
+        )
+
+
+class EmailTemplate:
+    """Compiled plain/HTML pair for one email type"""
+
+    def __init__(self, name: str, subject: str, text: CompiledTemplate, html_body: CompiledTemplate):
+        self.name = name
+        self.subject = subject
+        self.text = text
+        self.html = html_body
+
+    def render(self, from_email: str, to_email: str, **fields) -> MIMEMultipart:
+        """
+        Render a multipart/alternative message for one recipient
+
+        Args:
+            from_email: Sender address
+            to_email: Recipient address
+            **fields: Per-user values for the template placeholders
+
+        Returns:
+            MIMEMultipart: Message with plain text and HTML parts
+        """
+        escaped = {key: html.escape(str(value)) for key, value in fields.items()}
+        msg = MIMEMultipart('alternative')
+        msg['Subject'] = self.subject
+        msg['From'] = from_email
+        msg['To'] = to_email
+        msg.attach(MIMEText(self.text.render(fields), 'plain'))
+        msg.attach(MIMEText(self.html.render(escaped), 'html'))
+        return msg
+
+
+def _read(filename: str) -> str:
+    return (TEMPLATE_DIR / filename).read_text(encoding="utf-8")
+
+
+def load_templates() -> dict[str, EmailTemplate]:
+    """Read every template once and fold the static layout into each body"""
+    text_layout = Template(_read("layout.txt"))
+    html_layout = Template(_read("layout.html"))
+    templates = {}
+    for name, meta in EMAILS.items():
+        # safe_substitute leaves per-user ${fields} in place for render time
+        text = text_layout.safe_substitute(content=_read(f"{name}.txt").rstrip("\n"))
+        html_body = html_layout.safe_substitute(
+            heading=meta["heading"],
+            content=_read(f"{name}.html").rstrip("\n")
+        )
+        templates[name] = EmailTemplate(name, meta["subject"], CompiledTemplate(text), CompiledTemplate(html_body))
+    return templates
+
+
+email_templates = load_templates()
@@ -1,23 +1,88 @@
+import os
+import time
 import bcrypt
+from dotenv import load_dotenv
 
-def hash_password(password: str) -> str:
-    # Truncate password to 72 bytes if necessary
+load_dotenv()
+
+# Hashing policy: "bcrypt" or "argon2id" (needs argon2-cffi)
+PASSWORD_HASH_SCHEME = os.getenv("PASSWORD_HASH_SCHEME", "bcrypt")
+# bcrypt work factor; each +1 doubles the CPU cost of hashing and verifying
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 12))
+ARGON2_TIME_COST = int(os.getenv("ARGON2_TIME_COST", 3))
+ARGON2_MEMORY_COST = int(os.getenv("ARGON2_MEMORY_COST", 65536))  # KiB
+ARGON2_PARALLELISM = int(os.getenv("ARGON2_PARALLELISM", 1))
+
+_BCRYPT_PREFIXES = ("$2a$", "$2b$", "$2y$")
+_ARGON2_PREFIX = "$argon2id$"
+
+
+def _argon2_hasher(time_cost: int = None, memory_cost: int = None, parallelism: int = None):
+    try:
+        from argon2 import PasswordHasher
+    except ImportError:
+        raise RuntimeError("PASSWORD_HASH_SCHEME=argon2id requires the 'argon2-cffi' package")
+    return PasswordHasher(
+        time_cost=time_cost or ARGON2_TIME_COST,
+        memory_cost=memory_cost or ARGON2_MEMORY_COST,
+        parallelism=parallelism or ARGON2_PARALLELISM,
+    )
+
+
+def _truncate(password: str) -> bytes:
+    # bcrypt only uses the first 72 bytes
     password_bytes = password.encode('utf-8')
     if len(password_bytes) > 72:
         password_bytes = password_bytes[:72]
-    
+    return password_bytes
+
+
+def hash_password(password: str) -> str:
+    if PASSWORD_HASH_SCHEME == "argon2id":
+        return _argon2_hasher().hash(password)
     # Generate salt and hash
-    salt = bcrypt.gensalt()
-    hashed = bcrypt.hashpw(password_bytes, salt)
+    salt = bcrypt.gensalt(rounds=BCRYPT_ROUNDS)
+    hashed = bcrypt.hashpw(_truncate(password), salt)
     return hashed.decode('utf-8')
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    # Truncate password to 72 bytes if necessary
-    password_bytes = plain_password.encode('utf-8')
-    if len(password_bytes) > 72:
-        password_bytes = password_bytes[:72]
-    
     try:
-        return bcrypt.checkpw(password_bytes, hashed_password.encode('utf-8'))
+        if hashed_password.startswith(_ARGON2_PREFIX):
+            return _argon2_hasher().verify(hashed_password, plain_password)
+        return bcrypt.checkpw(_truncate(plain_password), hashed_password.encode('utf-8'))
     except Exception:
-        return False
\ No newline at end of file
+        return False
+
+
+def needs_rehash(hashed_password: str) -> bool:
+    """
+    Check whether a stored hash was made with a different scheme or cost
+    than the current policy
+    """
+    if PASSWORD_HASH_SCHEME == "argon2id":
+        if not hashed_password.startswith(_ARGON2_PREFIX):
+            return True
+        try:
+            return _argon2_hasher().check_needs_rehash(hashed_password)
+        except RuntimeError:
+            return False
+    if not hashed_password.startswith(_BCRYPT_PREFIXES):
+        return True
+    # bcrypt format: $2b$<rounds>$<salt+hash>
+    try:
+        return int(hashed_password.split("$")[2]) != BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return True
+
+
+# Worker-side entry points for the password pool: return (result, started_at, duration)
+def timed_hash_password(password: str) -> tuple:
+    started_at = time.time()
+    result = hash_password(password)
+    return result, started_at, time.time() - started_at
+
+
+def timed_verify_password(plain_password: str, hashed_password: str) -> tuple:
+    started_at = time.time()
+    result = verify_password(plain_password, hashed_password)
+    return result, started_at, time.time() - started_at
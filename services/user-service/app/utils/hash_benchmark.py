@@ -0,0 +1,82 @@
+# app/utils/hash_benchmark.py
+"""
+Password hashing throughput benchmark
+
+Reports hashes/sec on a single core for each candidate setting, to size
+the user-service fleet against expected login/registration rates.
+
+Usage:
+    python -m app.utils.hash_benchmark
+    python -m app.utils.hash_benchmark --bcrypt-rounds 10 11 12 13 --seconds 3
+"""
+import argparse
+import os
+import time
+import bcrypt
+
+SAMPLE_PASSWORD = "BenchmarkPassw0rd"
+
+
+def _measure(fn, seconds: float) -> tuple:
+    """Run fn repeatedly for about `seconds`; returns (iterations, elapsed)"""
+    fn()  # warm-up
+    iterations = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        fn()
+        iterations += 1
+    return iterations, time.perf_counter() - start
+
+
+def bench_bcrypt(rounds: int, seconds: float) -> dict:
+    password = SAMPLE_PASSWORD.encode("utf-8")
+    hashed = bcrypt.hashpw(password, bcrypt.gensalt(rounds=rounds))
+    iterations, elapsed = _measure(lambda: bcrypt.checkpw(password, hashed), seconds)
+    return {"setting": f"bcrypt rounds={rounds}", "iterations": iterations, "elapsed": elapsed}
+
+
+def bench_argon2(time_cost: int, memory_cost: int, parallelism: int, seconds: float) -> dict | None:
+    try:
+        from argon2 import PasswordHasher
+    except ImportError:
+        return None
+    hasher = PasswordHasher(time_cost=time_cost, memory_cost=memory_cost, parallelism=parallelism)
+    hashed = hasher.hash(SAMPLE_PASSWORD)
+    iterations, elapsed = _measure(lambda: hasher.verify(hashed, SAMPLE_PASSWORD), seconds)
+    return {
+        "setting": f"argon2id t={time_cost} m={memory_cost}KiB p={parallelism}",
+        "iterations": iterations,
+        "elapsed": elapsed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Password hashing throughput per core")
+    parser.add_argument("--bcrypt-rounds", type=int, nargs="+", default=[10, 11, 12, 13])
+    parser.add_argument("--argon2-time-cost", type=int, nargs="+", default=[2, 3])
+    parser.add_argument("--argon2-memory-cost", type=int, nargs="+", default=[19456, 65536])
+    parser.add_argument("--argon2-parallelism", type=int, default=1)
+    parser.add_argument("--seconds", type=float, default=2.0, help="Time spent per setting")
+    args = parser.parse_args()
+
+    results = [bench_bcrypt(rounds, args.seconds) for rounds in args.bcrypt_rounds]
+    argon2_results = [
+        bench_argon2(time_cost, memory_cost, args.argon2_parallelism, args.seconds)
+        for time_cost in args.argon2_time_cost
+        for memory_cost in args.argon2_memory_cost
+    ]
+    if None in argon2_results:
+        print("argon2-cffi not installed, skipping argon2id settings")
+    else:
+        results.extend(argon2_results)
+
+    cores = os.cpu_count() or 1
+    print(f"\n{'setting':<40} {'ms/hash':>10} {'hashes/s/core':>15} {'hashes/s (' + str(cores) + ' cores)':>22}")
+    for result in results:
+        per_core = result["iterations"] / result["elapsed"] if result["elapsed"] else 0.0
+        ms = 1000 / per_core if per_core else float("inf")
+        print(f"{result['setting']:<40} {ms:>10.1f} {per_core:>15.1f} {per_core * cores:>22.1f}")
+
+
+if __name__ == "__main__":
+    main()
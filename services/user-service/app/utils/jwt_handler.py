@@ -1,23 +1,90 @@
 from datetime import datetime, timedelta
 from jose import jwt, JWTError
 import os
+import time
+import uuid
 from dotenv import load_dotenv
+from app.utils.revocation_list import revocation_list
 
 load_dotenv()
 
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-this-in-production")
 ALGORITHM = "HS256"
-ACCESS_TOKEN_EXPIRE_MINUTES = 30
+ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 15))
+REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", 7))
 
-def create_access_token(data: dict):
+ACCESS_TOKEN = "access"
+REFRESH_TOKEN = "refresh"
+
+
+def _encode(data: dict, token_type: str, expires_delta: timedelta) -> str:
     to_encode = data.copy()
-    expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
+    expire = datetime.utcnow() + expires_delta
+    to_encode.update({"exp": expire, "jti": uuid.uuid4().hex, "type": token_type})
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
-def verify_token(token: str):
+
+def create_access_token(data: dict):
+    return _encode(data, ACCESS_TOKEN, timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
+
+
+def create_refresh_token(data: dict):
+    return _encode(data, REFRESH_TOKEN, timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS))
+
+
+def create_token_pair(data: dict, family: str | None = None) -> dict:
+    """
+    Issue an access token and a refresh token sharing one token family
+
+    The family id survives refresh rotation, so revoking it logs out every
+    token descended from the same login.
+    """
+    claims = {**data, "fam": family or uuid.uuid4().hex}
+    return {
+        "access_token": create_access_token(claims),
+        "refresh_token": create_refresh_token(claims),
+        "expires_in": ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    }
+
+
+def revoke_token(payload: dict):
+    """Revoke one decoded token until its own expiry"""
+    if payload.get("jti"):
+        revocation_list.revoke(payload["jti"], float(payload["exp"]))
+
+
+def revoke_family(payload: dict):
+    """Revoke every token from the decoded token's login, access and refresh alike"""
+    if payload.get("fam"):
+        # Outlives any refresh token the family can still hold
+        expires_at = time.time() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS).total_seconds()
+        revocation_list.revoke(f"fam:{payload['fam']}", expires_at)
+
+
+def is_revoked(payload: dict) -> bool:
+    jti = payload.get("jti")
+    family = payload.get("fam")
+    return bool(
+        (jti and revocation_list.is_revoked(jti))
+        or (family and revocation_list.is_revoked(f"fam:{family}"))
+    )
+
+
+def decode_token(token: str):
+    """Decode a signed, unexpired token without checking its type or revocation"""
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
+        return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
     except JWTError:
-        return None
\ No newline at end of file
+        return None
+
+
+def verify_token(token: str, token_type: str = ACCESS_TOKEN):
+    payload = decode_token(token)
+    if payload is None:
+        return None
+    # Tokens issued before typed tokens existed are access tokens
+    if payload.get("type", ACCESS_TOKEN) != token_type:
+        return None
+    if is_revoked(payload):
+        return None
+    return payload
@@ -0,0 +1,168 @@
+# app/utils/password_pool.py
+import os
+import asyncio
+import threading
+import time
+import multiprocessing
+import logging
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FuturesTimeoutError
+from dotenv import load_dotenv
+from app.utils.hash import timed_hash_password, timed_verify_password
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Worker processes for bcrypt; 0 runs hashing inline in the request thread
+PASSWORD_POOL_SIZE = int(os.getenv("PASSWORD_POOL_SIZE", os.cpu_count() or 1))
+# Requests allowed to wait for a worker before new ones are rejected
+PASSWORD_POOL_MAX_PENDING = int(os.getenv("PASSWORD_POOL_MAX_PENDING", 64))
+PASSWORD_POOL_TIMEOUT = float(os.getenv("PASSWORD_POOL_TIMEOUT", 10))
+
+
+class PasswordPoolBusy(Exception):
+    """Raised when the password pool queue is full"""
+
+
+class PasswordPool:
+    """
+    Runs bcrypt work on a bounded process pool
+
+    Hashing is CPU-bound, so it runs in separate processes to use every
+    core and keep the web threadpool free for other endpoints. Async
+    callers await the worker instead of blocking the event loop. Once
+    `max_pending` calls are queued or running, new calls fail fast with
+    PasswordPoolBusy instead of piling up.
+    """
+
+    def __init__(self, workers: int, max_pending: int, timeout: float):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self._executor = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.queue_wait_total = 0.0
+        self.hash_time_total = 0.0
+        self.queue_wait_max = 0.0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    # spawn avoids forking a process that already runs server threads
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                    )
+        return self._executor
+
+    def _acquire(self):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.rejected += 1
+                raise PasswordPoolBusy("Password hashing is overloaded, try again shortly")
+            self._pending += 1
+
+    def _release(self, _future=None):
+        with self._lock:
+            self._pending -= 1
+
+    def _submit(self, fn, *args):
+        """
+        Reserve a slot and submit to the pool
+
+        The slot is released when the worker is done with the job, not when
+        the caller stops waiting: a timed-out job keeps its worker busy, so
+        it must keep counting against max_pending until it finishes or is
+        cancelled before it started.
+        """
+        self._acquire()
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(self._release)
+        return future
+
+    def _run(self, fn, *args):
+        if self.workers <= 0:
+            result, _, duration = fn(*args)
+            self._record(0.0, duration)
+            return result
+
+        submitted_at = time.time()
+        future = self._submit(fn, *args)
+        try:
+            result, started_at, duration = future.result(self.timeout)
+        except FuturesTimeoutError:
+            # Only succeeds if no worker has picked the job up yet
+            future.cancel()
+            self.rejected += 1
+            raise PasswordPoolBusy("Password hashing timed out, try again shortly")
+        self._record(max(0.0, started_at - submitted_at), duration)
+        return result
+
+    async def _run_async(self, fn, *args):
+        loop = asyncio.get_running_loop()
+        if self.workers <= 0:
+            # Inline mode still must not block the event loop
+            result, _, duration = await loop.run_in_executor(None, fn, *args)
+            self._record(0.0, duration)
+            return result
+
+        submitted_at = time.time()
+        future = self._submit(fn, *args)
+        try:
+            result, started_at, duration = await asyncio.wait_for(
+                asyncio.wrap_future(future), self.timeout
+            )
+        except asyncio.TimeoutError:
+            future.cancel()
+            self.rejected += 1
+            raise PasswordPoolBusy("Password hashing timed out, try again shortly")
+        self._record(max(0.0, started_at - submitted_at), duration)
+        return result
+
+    def _record(self, queue_wait: float, duration: float):
+        with self._lock:
+            self.completed += 1
+            self.queue_wait_total += queue_wait
+            self.hash_time_total += duration
+            self.queue_wait_max = max(self.queue_wait_max, queue_wait)
+
+    def hash_password(self, password: str) -> str:
+        return self._run(timed_hash_password, password)
+
+    def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        return self._run(timed_verify_password, plain_password, hashed_password)
+
+    async def hash_password_async(self, password: str) -> str:
+        return await self._run_async(timed_hash_password, password)
+
+    async def verify_password_async(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run_async(timed_verify_password, plain_password, hashed_password)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict:
+        completed = self.completed or 1
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "pending": self._pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_queue_wait_ms": round(self.queue_wait_total / completed * 1000, 2),
+            "max_queue_wait_ms": round(self.queue_wait_max * 1000, 2),
+            "avg_hash_time_ms": round(self.hash_time_total / completed * 1000, 2),
+        }
+
+
+password_pool = PasswordPool(PASSWORD_POOL_SIZE, PASSWORD_POOL_MAX_PENDING, PASSWORD_POOL_TIMEOUT)
@@ -0,0 +1,116 @@
+# app/utils/revocation_list.py
+import os
+import math
+import hashlib
+import threading
+import time
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Revocations expected to be live at once, and the bloom filter's target false-positive rate
+REVOCATION_CAPACITY = int(os.getenv("REVOCATION_CAPACITY", 100000))
+REVOCATION_ERROR_RATE = float(os.getenv("REVOCATION_ERROR_RATE", 0.001))
+# How often expired revocations are purged and the filter rebuilt
+REVOCATION_PURGE_INTERVAL = float(os.getenv("REVOCATION_PURGE_INTERVAL", 300))
+
+
+class BloomFilter:
+    """Fixed-size bloom filter over strings, backed by a bytearray"""
+
+    def __init__(self, capacity: int, error_rate: float):
+        capacity = max(capacity, 1)
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str):
+        # Double hashing: k positions from two 64-bit halves of one digest
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, key: str):
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+class RevocationList:
+    """
+    In-memory set of revoked token ids (jti) and token families
+
+    A bloom filter answers the common "not revoked" case without touching
+    the exact set; only filter hits consult the exact jti -> expiry map.
+    Entries are kept until the token they revoke would have expired
+    anyway, then purged, and the filter is rebuilt from what remains.
+    Every check is O(1) and never touches the database.
+
+    This is a per-process cache, not the source of truth. Refresh tokens
+    (single use, reuse detection, family revocation) are also checked
+    against the shared revoked_tokens table, and the list is seeded from
+    that table at startup. This service's own routes check access tokens
+    only here, so on other replicas a revoked access token keeps working
+    until it expires, at most ACCESS_TOKEN_EXPIRE_MINUTES; the gateway
+    closes that gap through /auth/introspect, which reads the table.
+    """
+
+    def __init__(self, capacity: int, error_rate: float, purge_interval: float):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.purge_interval = purge_interval
+        self._filter = BloomFilter(capacity, error_rate)
+        self._expiry: dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._next_purge = time.time() + purge_interval
+        self.checks = 0
+        self.filter_hits = 0
+        self.false_positives = 0
+
+    def revoke(self, key: str, expires_at: float):
+        """Revoke a jti or family id until `expires_at` (unix time)"""
+        now = time.time()
+        if expires_at <= now:
+            return
+        with self._lock:
+            self._expiry[key] = max(expires_at, self._expiry.get(key, 0.0))
+            self._filter.add(key)
+            if now >= self._next_purge or len(self._expiry) > self.capacity:
+                self._purge(now)
+
+    def is_revoked(self, key: str) -> bool:
+        self.checks += 1
+        if key not in self._filter:
+            return False
+        self.filter_hits += 1
+        expires_at = self._expiry.get(key)
+        if expires_at is None or expires_at <= time.time():
+            self.false_positives += 1
+            return False
+        return True
+
+    def _purge(self, now: float):
+        self._expiry = {key: exp for key, exp in self._expiry.items() if exp > now}
+        # Grow the filter if live revocations outgrew it
+        self.capacity = max(self.capacity, len(self._expiry) * 2)
+        rebuilt = BloomFilter(self.capacity, self.error_rate)
+        for key in self._expiry:
+            rebuilt.add(key)
+        self._filter = rebuilt
+        self._next_purge = now + self.purge_interval
+
+    def stats(self) -> dict:
+        return {
+            "revoked": len(self._expiry),
+            "capacity": self.capacity,
+            "filter_bytes": len(self._filter._bits),
+            "checks": self.checks,
+            "filter_hits": self.filter_hits,
+            "false_positives": self.false_positives,
+        }
+
+
+revocation_list = RevocationList(REVOCATION_CAPACITY, REVOCATION_ERROR_RATE, REVOCATION_PURGE_INTERVAL)
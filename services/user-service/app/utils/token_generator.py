@@ -1,6 +1,7 @@
 # app/utils/token_generator.py
 import uuid
 import secrets
+import hashlib
 
 
 def generate_verification_token() -> str:
@@ -23,4 +24,17 @@ def generate_secure_token(length: int = 32) -> str:
     Returns:
         str: Secure random token
     """
-    return secrets.token_urlsafe(length)
\ No newline at end of file
+    return secrets.token_urlsafe(length)
+
+
+def hash_token(token: str) -> str:
+    """
+    Fixed-width digest used to store and look up a token
+    
+    Args:
+        token: Raw token as sent to the user
+        
+    Returns:
+        str: 64-character hex SHA-256 of the token
+    """
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
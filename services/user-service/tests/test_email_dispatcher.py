@@ -0,0 +1,126 @@
+"""
+EmailDispatcher against a real local SMTP server (aiosmtpd)
+
+Run from services/user-service:
+    pip install -r requirements-dev.txt
+    python -m pytest tests
+"""
+import asyncio
+import socket
+import threading
+from email.mime.text import MIMEText
+
+import pytest
+from aiosmtpd.controller import Controller
+
+from app.utils import email_dispatcher as dispatcher_module
+from app.utils.email_dispatcher import EmailDispatcher
+
+
+class RecordingHandler:
+    """Records each delivered message with the client address it arrived on"""
+
+    def __init__(self):
+        self.messages = []
+        self._lock = threading.Lock()
+
+    async def handle_DATA(self, server, session, envelope):
+        with self._lock:
+            self.messages.append((session.peer, envelope.rcpt_tos[0]))
+        return "250 Message accepted for delivery"
+
+    @property
+    def peers(self) -> set:
+        # One client address per TCP connection
+        return {peer for peer, _ in self.messages}
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def smtp_server(monkeypatch):
+    handler = RecordingHandler()
+    controller = Controller(handler, hostname="127.0.0.1", port=_free_port())
+    controller.start()
+    # Connection settings are read when a connection opens, so patching the module is enough
+    monkeypatch.setattr(dispatcher_module, "SMTP_HOST", controller.hostname)
+    monkeypatch.setattr(dispatcher_module, "SMTP_PORT", controller.port)
+    monkeypatch.setattr(dispatcher_module, "SMTP_STARTTLS", False)
+    monkeypatch.setattr(dispatcher_module, "SMTP_USER", None)
+    try:
+        yield handler
+    finally:
+        controller.stop()
+
+
+def _message(index: int) -> MIMEText:
+    message = MIMEText(f"Body {index}")
+    message["Subject"] = f"Test {index}"
+    message["From"] = "noreply@example.com"
+    message["To"] = f"user{index}@example.com"
+    return message
+
+
+def _send_all(dispatcher: EmailDispatcher, count: int, rounds: int = 1, pause: float = 0.0):
+    async def run():
+        dispatcher.start()
+        for round_index in range(rounds):
+            for i in range(count):
+                index = round_index * count + i
+                dispatcher.submit("noreply@example.com", f"user{index}@example.com", _message(index))
+            await asyncio.wait_for(dispatcher._queue.join(), 10)
+            await asyncio.sleep(pause)
+        stats = dispatcher.stats()
+        await dispatcher.stop()
+        return stats
+
+    return asyncio.run(run())
+
+
+def test_messages_share_one_connection(smtp_server):
+    dispatcher = EmailDispatcher(connections=1, max_queue=100, batch_size=10, batch_wait=0.01)
+
+    stats = _send_all(dispatcher, 25)
+
+    assert len(smtp_server.messages) == 25
+    assert {rcpt for _, rcpt in smtp_server.messages} == {f"user{i}@example.com" for i in range(25)}
+    # Several batches, but one SMTP session for all of them
+    assert stats["batches"] > 1
+    assert stats["connects_total"] == 1
+    assert len(smtp_server.peers) == 1
+    assert stats["sent"] == 25 and stats["failed"] == 0
+
+
+def test_connection_is_reused_across_idle_gaps(smtp_server):
+    dispatcher = EmailDispatcher(connections=1, max_queue=100, batch_size=5, batch_wait=0.01)
+
+    stats = _send_all(dispatcher, 5, rounds=3, pause=0.05)
+
+    assert len(smtp_server.messages) == 15
+    assert stats["connects_total"] == 1
+    assert len(smtp_server.peers) == 1
+
+
+def test_pool_never_opens_more_than_its_size(smtp_server):
+    dispatcher = EmailDispatcher(connections=2, max_queue=500, batch_size=5, batch_wait=0.01)
+
+    stats = _send_all(dispatcher, 200)
+
+    assert len(smtp_server.messages) == 200
+    assert stats["connects_total"] <= 2
+    assert len(smtp_server.peers) <= 2
+
+
+def test_idle_connection_is_reopened(smtp_server, monkeypatch):
+    monkeypatch.setattr(dispatcher_module, "EMAIL_IDLE_TIMEOUT", 0.01)
+    dispatcher = EmailDispatcher(connections=1, max_queue=100, batch_size=5, batch_wait=0.01)
+
+    stats = _send_all(dispatcher, 5, rounds=2, pause=0.1)
+
+    assert len(smtp_server.messages) == 10
+    assert stats["connects_total"] == 2
+    assert len(smtp_server.peers) == 2
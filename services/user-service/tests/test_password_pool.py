@@ -0,0 +1,76 @@
+"""
+PasswordPool admission control with real worker processes
+
+Run from services/user-service:
+    pip install -r requirements-dev.txt
+    python -m pytest tests
+"""
+import asyncio
+import time
+
+import pytest
+
+from app.utils.password_pool import PasswordPool, PasswordPoolBusy
+
+JOB_SECONDS = 1.0
+
+
+def slow_job(value: str) -> tuple:
+    """Stands in for bcrypt: same (result, started_at, duration) shape, fixed cost"""
+    started_at = time.time()
+    time.sleep(JOB_SECONDS)
+    return value, started_at, time.time() - started_at
+
+
+def quick_job(value: str) -> tuple:
+    return value, time.time(), 0.0
+
+
+@pytest.fixture
+def pool():
+    pool = PasswordPool(workers=1, max_pending=2, timeout=0.2)
+    # Start the worker up front so spawn time does not count against the timeout
+    pool._get_executor().submit(quick_job, "warm-up").result(30)
+    try:
+        yield pool
+    finally:
+        pool.shutdown()
+
+
+def test_timed_out_jobs_keep_their_slots(pool):
+    # Two jobs time out while the single worker is still busy with them
+    for _ in range(2):
+        with pytest.raises(PasswordPoolBusy, match="timed out"):
+            pool._run(slow_job, "x")
+
+    # The caller gave up, but the work is still queued or running
+    assert pool.stats()["pending"] >= 1
+    rejected_before = pool.rejected
+    with pytest.raises(PasswordPoolBusy, match="overloaded"):
+        pool._run(slow_job, "x")
+    assert pool.rejected == rejected_before + 1
+
+
+def test_slots_come_back_when_the_work_finishes(pool):
+    for _ in range(2):
+        with pytest.raises(PasswordPoolBusy):
+            pool._run(slow_job, "x")
+
+    deadline = time.time() + 3 * JOB_SECONDS + 5
+    while pool.stats()["pending"] and time.time() < deadline:
+        time.sleep(0.05)
+
+    assert pool.stats()["pending"] == 0
+    pool.timeout = 5
+    assert pool._run(quick_job, "ok") == "ok"
+
+
+def test_async_timeouts_keep_their_slots(pool):
+    async def run():
+        for _ in range(2):
+            with pytest.raises(PasswordPoolBusy, match="timed out"):
+                await pool._run_async(slow_job, "x")
+        with pytest.raises(PasswordPoolBusy, match="overloaded"):
+            await pool._run_async(slow_job, "x")
+
+    asyncio.run(run())